@@ -5,9 +5,12 @@
 Serverless function for Vercel — trigger a WeRead -> Notion sync via HTTP.
 """
 
+import hmac
 import os
 import sys
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
@@ -17,10 +20,72 @@ src_path = str(Path(__file__).parent.parent / "src")
 if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
-from notion_client import Client
-from weread_api import WeReadAPI
-from weread_notion_sync import get_db_properties
-from weread_notion_sync_api import sync_books_from_api
+from config import DISABLED_VALUES
+
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
+
+# Fixed response bodies are serialized once at import, not per request
+_RESP_INVALID_KEY = _dumps({"error": "Invalid API key"})
+_RESP_MISSING_NOTION = _dumps({"error": "Missing NOTION_TOKEN or NOTION_DATABASE_ID"})
+_RESP_MISSING_COOKIES = _dumps({"error": "Missing WEREAD_COOKIES"})
+_RESP_SUCCESS = _dumps({"status": "success", "message": "Sync completed successfully"})
+
+# Oversized keys are rejected before the constant-time comparison runs.
+_MAX_API_KEY_LENGTH = 128
+
+# Sync dependencies (notion_client, requests, ...) are imported on first use so
+# that rejected requests don't pay for them on a cold start.
+_SYNC_DEPS = None
+
+
+def _load_sync_deps():
+    """Import and cache the modules needed to actually run a sync."""
+    global _SYNC_DEPS
+    if _SYNC_DEPS is None:
+        from notion_client import Client
+        from weread_api import WeReadAPI
+        from weread_notion_sync import get_db_properties
+        from weread_notion_sync_api import sync_books_from_api
+        _SYNC_DEPS = (Client, WeReadAPI, get_db_properties, sync_books_from_api)
+    return _SYNC_DEPS
+
+
+# Warm invocations reuse module globals, so keep the Notion client (and its
+# pooled HTTP connection) and the database schema around between requests.
+_DB_PROPS_TTL_SECONDS = 600
+_CLIENT_CACHE: dict = {}
+_DB_PROPS_CACHE: dict = {}
+
+
+def _get_notion_client(token: str):
+    client = _CLIENT_CACHE.get(token)
+    if client is None:
+        Client = _load_sync_deps()[0]
+        client = _CLIENT_CACHE[token] = Client(auth=token)
+    return client
+
+
+def _get_cached_db_properties(notion, token: str, database_id: str) -> dict:
+    key = (token, database_id)
+    cached = _DB_PROPS_CACHE.get(key)
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < _DB_PROPS_TTL_SECONDS:
+        return cached[1]
+    get_db_properties = _load_sync_deps()[2]
+    db_props = get_db_properties(notion, database_id)
+    _DB_PROPS_CACHE[key] = (now, db_props)
+    return db_props
 
 
 def _get_fresh_cookies() -> str:
@@ -35,7 +100,7 @@ def _get_fresh_cookies() -> str:
                          "Accept": "application/vnd.github.v3+json"},
             )
             with urlopen(req, timeout=5) as resp:
-                data = json.loads(resp.read())
+                data = _loads(resp.read())
                 cookies = data["files"]["weread_cookies.txt"]["content"]
                 if cookies:
                     return cookies
@@ -44,54 +109,73 @@ def _get_fresh_cookies() -> str:
     return os.environ.get("WEREAD_COOKIES", "")
 
 
-def _run_sync(query_params: dict) -> tuple[int, dict]:
-    NOTION_TOKEN = os.environ.get("NOTION_TOKEN")
-    NOTION_DATABASE_ID = os.environ.get("NOTION_DATABASE_ID")
-    WEREAD_COOKIES = _get_fresh_cookies()
-
-    expected_key = os.environ.get("SYNC_API_KEY", "")
-    api_key = query_params.get("key", [None])[0]
-    if expected_key and api_key != expected_key:
-        return 401, {"error": "Invalid API key"}
+def _run_sync(query_params: dict) -> tuple[int, bytes]:
+    """Run the sync for one request. Returns (HTTP status, JSON body bytes)."""
+    environ = os.environ
+    expected_key = environ.get("SYNC_API_KEY", "")
+    api_key = query_params.get("key", [None])[0] or ""
+    if expected_key and (
+        len(api_key) > _MAX_API_KEY_LENGTH
+        or not hmac.compare_digest(api_key.encode(), expected_key.encode())
+    ):
+        return 401, _RESP_INVALID_KEY
 
+    NOTION_TOKEN = environ.get("NOTION_TOKEN")
+    NOTION_DATABASE_ID = environ.get("NOTION_DATABASE_ID")
     if not NOTION_TOKEN or not NOTION_DATABASE_ID:
-        return 500, {"error": "Missing NOTION_TOKEN or NOTION_DATABASE_ID"}
-
-    if not WEREAD_COOKIES:
-        return 500, {"error": "Missing WEREAD_COOKIES"}
+        return 500, _RESP_MISSING_NOTION
 
+    # Only requests that passed the key check get here, so this is where the
+    # sync deps start loading (rejected cold starts never import them). The
+    # imports and the Notion schema lookup run in the background while the
+    # Gist fetch and the cookie renewal make their own round trips.
+    pool = ThreadPoolExecutor(max_workers=1)
     try:
-        limit = None
-        sync_limit = os.environ.get("SYNC_LIMIT")
-        if sync_limit:
+        db_props_future = pool.submit(
+            _load_db_properties, NOTION_TOKEN, NOTION_DATABASE_ID,
+        )
+
+        WEREAD_COOKIES = _get_fresh_cookies()
+        if not WEREAD_COOKIES:
+            return 500, _RESP_MISSING_COOKIES
+
+        try:
+            _, WeReadAPI, _, sync_books_from_api = _load_sync_deps()
+
             try:
-                limit = int(sync_limit)
-                if limit <= 0:
-                    limit = None
+                limit = int(environ.get("SYNC_LIMIT") or 0)
             except ValueError:
+                limit = 0
+            if limit <= 0:
                 limit = None
 
-        test_book_title = os.environ.get("WEREAD_TEST_BOOK_TITLE")
-        if test_book_title and test_book_title.lower() in (
-            "none", "null", "false", "off", "disable", "0",
-        ):
-            test_book_title = None
-
-        # Proactively renew cookies before syncing
-        api = WeReadAPI(WEREAD_COOKIES, auto_refresh=False)
-        if api.renew_cookies_silent():
-            WEREAD_COOKIES = api.get_cookie_string()
-
-        notion = Client(auth=NOTION_TOKEN)
-        db_props = get_db_properties(notion, NOTION_DATABASE_ID)
-        sync_books_from_api(
-            notion, NOTION_DATABASE_ID, db_props, WEREAD_COOKIES,
-            limit=limit, test_book_title=test_book_title,
-        )
+            test_book_title = environ.get("WEREAD_TEST_BOOK_TITLE")
+            if (test_book_title or "").strip().lower() in DISABLED_VALUES:
+                test_book_title = None
+
+            # Proactively renew cookies before syncing
+            with WeReadAPI(WEREAD_COOKIES, auto_refresh=False) as api:
+                if api.renew_cookies_silent():
+                    WEREAD_COOKIES = api.get_cookie_string()
+            notion, db_props = db_props_future.result()
+
+            sync_books_from_api(
+                notion, NOTION_DATABASE_ID, db_props, WEREAD_COOKIES,
+                limit=limit, test_book_title=test_book_title,
+            )
+
+            return 200, _RESP_SUCCESS
+        except Exception as e:
+            return 500, _dumps({"status": "error", "message": str(e)})
+    finally:
+        # Don't hold the response for a schema lookup nobody will read
+        pool.shutdown(wait=False)
+
 
-        return 200, {"status": "success", "message": "Sync completed successfully"}
-    except Exception as e:
-        return 500, {"status": "error", "message": str(e)}
+def _load_db_properties(token: str, database_id: str) -> tuple:
+    """Import the sync deps and return (Notion client, cached database schema)."""
+    notion = _get_notion_client(token)
+    return notion, _get_cached_db_properties(notion, token, database_id)
 
 
 class handler(BaseHTTPRequestHandler):
@@ -103,7 +187,7 @@ class handler(BaseHTTPRequestHandler):
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.end_headers()
-        self.wfile.write(json.dumps(body).encode())
+        self.wfile.write(body)
 
     def do_POST(self):
         self.do_GET()
@@ -4,14 +4,53 @@ Check WeRead cookies status and diagnose issues
 """
 
 import os
+import re
 import sys
 from pathlib import Path
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from weread_api import WeReadAPI
-from config import env
+from config import dequote, env, parse_cookies
+
+# KEY=value lines of a .env file (comments and blank lines never match)
+_ENV_LINE_RE = re.compile(r"(?m)^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t]*$")
+
+# Static help text, emitted with a single write instead of a print per line
+MISSING_ENV_HELP = """\
+❌ ERROR: WEREAD_COOKIES not found in environment
+
+🔧 SOLUTION:
+   1. Make sure you have a .env file
+   2. Add: WEREAD_COOKIES=wr_skey=xxx; wr_vid=xxx; wr_rt=xxx
+   3. Run: set -a && source .env && set +a
+"""
+
+FRESH_COOKIES_HELP = """\
+🔧 Get fresh cookies:
+   1. Open https://weread.qq.com in browser
+   2. Log in
+   3. Press F12 → Application → Cookies → weread.qq.com
+   4. Copy ALL cookie values
+   5. Update .env file
+"""
+
+EXPIRED_COOKIES_HELP = """
+{rule}
+❌ COOKIES ARE EXPIRED OR INVALID
+{rule}
+
+🔧 ACTION REQUIRED:
+   1. Open https://weread.qq.com in your browser
+   2. Make sure you're logged in
+   3. Press F12 → Application → Cookies → weread.qq.com
+   4. Copy ALL cookie values (especially wr_skey, wr_vid, wr_rt)
+   5. Update WEREAD_COOKIES in your .env file
+   6. Format: wr_skey=xxx; wr_vid=xxx; wr_rt=xxx
+
+💡 TIP: Cookies expire after some time. Get fresh ones from browser.
+""".format(rule="=" * 80)
+
 
 def check_cookies():
     """Check cookie status and diagnose issues"""
@@ -24,29 +63,11 @@ def check_cookies():
     cookies_str = env("WEREAD_COOKIES")
     
     if not cookies_str:
-        print("❌ ERROR: WEREAD_COOKIES not found in environment")
-        print()
-        print("🔧 SOLUTION:")
-        print("   1. Make sure you have a .env file")
-        print("   2. Add: WEREAD_COOKIES=wr_skey=xxx; wr_vid=xxx; wr_rt=xxx")
-        print("   3. Run: set -a && source .env && set +a")
+        sys.stdout.write(MISSING_ENV_HELP)
         return False
     
     # Parse cookies
-    cookie_dict = {}
-    cookies = cookies_str.strip()
-    if cookies.startswith('"') and cookies.endswith('"'):
-        cookies = cookies[1:-1]
-    if cookies.startswith("'") and cookies.endswith("'"):
-        cookies = cookies[1:-1]
-    
-    for item in cookies.split(";"):
-        item = item.strip()
-        if "=" in item:
-            key, value = item.split("=", 1)
-            key = key.strip()
-            value = value.strip()
-            cookie_dict[key] = value
+    cookie_dict = parse_cookies(dequote(cookies_str))
     
     print(f"📋 Found {len(cookie_dict)} cookies in .env")
     print()
@@ -58,12 +79,7 @@ def check_cookies():
     if missing:
         print(f"❌ MISSING REQUIRED COOKIES: {', '.join(missing)}")
         print()
-        print("🔧 Get fresh cookies:")
-        print("   1. Open https://weread.qq.com in browser")
-        print("   2. Log in")
-        print("   3. Press F12 → Application → Cookies → weread.qq.com")
-        print("   4. Copy ALL cookie values")
-        print("   5. Update .env file")
+        sys.stdout.write(FRESH_COOKIES_HELP)
         return False
     
     print("✅ All required cookies present:")
@@ -87,6 +103,8 @@ def check_cookies():
     print()
     
     try:
+        # Imported here so the early-exit paths above don't load requests/dateutil
+        from weread_api import WeReadAPI
         client = WeReadAPI(cookies_str)
         is_valid = client.validate_cookies()
         
@@ -97,20 +115,7 @@ def check_cookies():
             print("=" * 80)
             return True
         else:
-            print()
-            print("=" * 80)
-            print("❌ COOKIES ARE EXPIRED OR INVALID")
-            print("=" * 80)
-            print()
-            print("🔧 ACTION REQUIRED:")
-            print("   1. Open https://weread.qq.com in your browser")
-            print("   2. Make sure you're logged in")
-            print("   3. Press F12 → Application → Cookies → weread.qq.com")
-            print("   4. Copy ALL cookie values (especially wr_skey, wr_vid, wr_rt)")
-            print("   5. Update WEREAD_COOKIES in your .env file")
-            print("   6. Format: wr_skey=xxx; wr_vid=xxx; wr_rt=xxx")
-            print()
-            print("💡 TIP: Cookies expire after some time. Get fresh ones from browser.")
+            sys.stdout.write(EXPIRED_COOKIES_HELP)
             return False
             
     except ValueError as e:
@@ -134,12 +139,8 @@ if __name__ == "__main__":
     # Load .env if available
     env_file = Path(__file__).parent.parent / ".env"
     if env_file.exists():
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
+        for m in _ENV_LINE_RE.finditer(env_file.read_text(encoding="utf-8")):
+            os.environ[m.group(1)] = dequote(m.group(2))
     
     success = check_cookies()
     sys.exit(0 if success else 1)
@@ -24,29 +24,33 @@ def main():
     notion = Client(auth=NOTION_TOKEN)
     db_props = get_db_properties(notion, NOTION_DATABASE_ID)
     
-    print("=" * 60)
-    print("Notion Database Properties")
-    print("=" * 60)
-    print()
+    # Build the whole report, then emit it with a single write
+    rule = "=" * 60
+    out = [rule, "Notion Database Properties", rule, ""]
     
     title_props = []
     for prop_name, prop_info in db_props.items():
         prop_type = prop_info.get("type", "unknown")
-        print(f"  {prop_name}: {prop_type}")
+        out.append(f"  {prop_name}: {prop_type}")
         if prop_type == "title":
             title_props.append(prop_name)
     
-    print()
-    print("=" * 60)
+    out += ["", rule]
     if title_props:
-        print(f"✅ Title property found: {title_props[0]}")
-        print()
-        print(f"Set in your .env file:")
-        print(f'NOTION_TITLE_PROP="{title_props[0]}"')
+        out += [
+            f"✅ Title property found: {title_props[0]}",
+            "",
+            "Set in your .env file:",
+            f'NOTION_TITLE_PROP="{title_props[0]}"',
+        ]
     else:
-        print("⚠️  No title property found!")
-        print("   Your database needs a title property (the first column)")
-    print("=" * 60)
+        out += [
+            "⚠️  No title property found!",
+            "   Your database needs a title property (the first column)",
+        ]
+    out.append(rule)
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
@@ -5,6 +5,7 @@ Check what status options are available in your Notion database
 
 import os
 import sys
+from itertools import islice
 from pathlib import Path
 
 # Add src to path
@@ -28,7 +29,7 @@ def main():
     
     if status_prop_name not in db_props:
         print(f"❌ Status property '{status_prop_name}' not found in database")
-        print(f"Available properties: {', '.join(list(db_props.keys())[:10])}")
+        print(f"Available properties: {', '.join(islice(db_props, 10))}")
         return
     
     status_prop = db_props[status_prop_name]
@@ -42,58 +43,55 @@ def main():
     options_key = "select" if prop_type == "select" else "status"
     options = status_prop.get(options_key, {}).get("options", [])
     
-    print("=" * 60)
-    print("Notion Status Options")
-    print("=" * 60)
-    print()
+    # Build the whole report, then emit it with a single write
+    rule = "=" * 60
+    out = [rule, "Notion Status Options", rule, ""]
     
+    # Single pass over the options: list them and collect names for matching
+    option_names = set()
     if not options:
-        print("⚠️  No options found in Status property")
+        out.append("⚠️  No options found in Status property")
     else:
-        print(f"Found {len(options)} status options:")
+        out.append(f"Found {len(options)} status options:")
         for i, opt in enumerate(options, 1):
-            name = opt.get("name", "Unknown")
+            name = opt.get("name")
+            if name:
+                option_names.add(name)
             color = opt.get("color", "default")
-            print(f"  {i}. {name} (color: {color})")
+            out.append(f"  {i}. {name or 'Unknown'} (color: {color})")
     
-    print()
-    print("=" * 60)
-    print("Current .env settings:")
-    print("=" * 60)
-    print(f'STATUS_TBR="{env("STATUS_TBR", "To Be Read")}"')
-    print(f'STATUS_READING="{env("STATUS_READING", "Currently Reading")}"')
-    print(f'STATUS_READ="{env("STATUS_READ", "Read")}"')
-    print()
-    
-    # Check if they match
-    option_names = [opt.get("name") for opt in options]
     tbr = env("STATUS_TBR", "To Be Read")
     reading = env("STATUS_READING", "Currently Reading")
     read = env("STATUS_READ", "Read")
+    configured = (tbr, reading, read)
     
-    print("Matching check:")
-    if tbr in option_names:
-        print(f"  ✅ '{tbr}' found in Notion")
-    else:
-        print(f"  ❌ '{tbr}' NOT found in Notion")
+    out += [
+        "",
+        rule,
+        "Current .env settings:",
+        rule,
+        f'STATUS_TBR="{tbr}"',
+        f'STATUS_READING="{reading}"',
+        f'STATUS_READ="{read}"',
+        "",
+    ]
     
-    if reading in option_names:
-        print(f"  ✅ '{reading}' found in Notion")
-    else:
-        print(f"  ❌ '{reading}' NOT found in Notion")
-    
-    if read in option_names:
-        print(f"  ✅ '{read}' found in Notion")
-    else:
-        print(f"  ❌ '{read}' NOT found in Notion")
+    # Check if they match
+    out.append("Matching check:")
+    for value in configured:
+        if value in option_names:
+            out.append(f"  ✅ '{value}' found in Notion")
+        else:
+            out.append(f"  ❌ '{value}' NOT found in Notion")
     
-    print()
-    print("=" * 60)
-    if all(x in option_names for x in [tbr, reading, read]):
-        print("✅ All status values match!")
+    out += ["", rule]
+    if all(x in option_names for x in configured):
+        out.append("✅ All status values match!")
     else:
-        print("⚠️  Update your .env file to match the exact option names above")
-    print("=" * 60)
+        out.append("⚠️  Update your .env file to match the exact option names above")
+    out.append(rule)
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
@@ -11,7 +11,7 @@ import json
 import os
 import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -40,7 +40,7 @@ def compute(cookies: str) -> dict:
             for e in entries:
                 ts, secs = e.get("readDate", 0), e.get("readTime", 0)
                 if ts and secs:
-                    ds = datetime.fromtimestamp(ts, tz=CST).strftime("%Y-%m-%d")
+                    ds = datetime.fromtimestamp(ts, tz=CST).date().isoformat()
                     result[ds] = result.get(ds, 0) + secs
             return result
         except Exception:
@@ -57,30 +57,29 @@ def compute(cookies: str) -> dict:
             if done % 20 == 0:
                 print(f"  {done}/{len(books_with_time)} books processed")
 
-    sorted_dates = sorted(days.keys())
     current_streak = longest_streak = 0
 
-    if sorted_dates:
-        today = datetime.now(CST).strftime("%Y-%m-%d")
-        yesterday = (datetime.now(CST) - timedelta(days=1)).strftime("%Y-%m-%d")
+    if days:
+        # Streaks are runs of consecutive day ordinals; plain integer math
+        # instead of re-parsing and re-formatting date strings per step.
+        ordinals = sorted(date.fromisoformat(d).toordinal() for d in days)
+        day_set = set(ordinals)
 
         streak, prev = 0, None
-        for d in sorted_dates:
-            dt = datetime.strptime(d, "%Y-%m-%d").date()
-            streak = streak + 1 if prev and (dt - prev).days == 1 else 1
+        for o in ordinals:
+            streak = streak + 1 if prev is not None and o - prev == 1 else 1
             longest_streak = max(longest_streak, streak)
-            prev = dt
+            prev = o
 
+        # The current streak may end today or, if nothing was read yet today,
+        # yesterday.
+        check = datetime.now(CST).date().toordinal()
+        if check not in day_set:
+            check -= 1
         streak = 0
-        check = today
-        while check in days:
+        while check in day_set:
             streak += 1
-            check = (datetime.strptime(check, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
-        if streak == 0:
-            check = yesterday
-            while check in days:
-                streak += 1
-                check = (datetime.strptime(check, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+            check -= 1
         current_streak = streak
 
     result = {
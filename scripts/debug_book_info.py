@@ -7,13 +7,14 @@ Debug script to output all book information for a specific book.
 
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from weread_api import WeReadAPI
-from config import env
+from weread_api import WeReadAPI, book_info_extractor
+from config import env, first_value
 
 
 def json_serial(obj):
@@ -30,11 +31,13 @@ def print_section(title: str):
 
 def print_json(data, title: str = ""):
     if title:
-        print(f"\n{title}:")
+        sys.stdout.write(f"\n{title}:\n")
     try:
-        print(json.dumps(data, ensure_ascii=False, indent=2, default=json_serial))
+        # Stream straight into stdout instead of building the whole string first
+        json.dump(data, sys.stdout, ensure_ascii=False, indent=2, default=json_serial)
+        sys.stdout.write("\n")
     except Exception as e:
-        print(f"Error serializing: {e}")
+        print(f"\nError serializing: {e}")
 
 
 def main():
@@ -50,62 +53,77 @@ def main():
     print_section(f"Searching shelf for: {book_title}")
     shelf_data, all_books_list, book_progress_list = client.get_shelf()
 
-    target_book_item = None
-    target_book_id = None
-
+    # Index the shelf by title once; exact hits are a dict lookup and only
+    # misses fall back to the substring scan.
+    extract_info = book_info_extractor(all_books_list[0] if all_books_list else None)
+    by_title: dict = {}
     for book_item in all_books_list:
-        info = book_item.get("book") or book_item.get("bookInfo") or book_item
-        title = info.get("title", "")
-        if book_title in title or title in book_title:
-            target_book_item = book_item
-            target_book_id = info.get("bookId")
-            print(f"Found: {title} (ID: {target_book_id})")
-            break
-
-    if not target_book_id:
+        info = extract_info(book_item)
+        title = first_value(info, "title", "name")
+        if title:
+            by_title.setdefault(title, book_item)
+
+    target_book_item = by_title.get(book_title)
+    if target_book_item is None:
+        target_book_item = next(
+            (item for title, item in by_title.items()
+             if book_title in title or title in book_title),
+            None,
+        )
+
+    if target_book_item is None:
         print(f"Book '{book_title}' not found. Available:")
         for i, item in enumerate(all_books_list[:10], 1):
-            info = item.get("book") or item.get("bookInfo") or item
-            print(f"  {i}. {info.get('title', '?')}")
+            print(f"  {i}. {extract_info(item).get('title', '?')}")
         return
 
+    target_info = extract_info(target_book_item)
+    target_book_id = target_info.get("bookId")
+    print(f"Found: {first_value(target_info, 'title', 'name')} (ID: {target_book_id})")
+
     print_section("Shelf entry")
     print_json(target_book_item)
 
-    print_section("GET /web/book/info")
-    print_json(client.get_book_info(target_book_id))
-
-    print_section("GET /web/book/readinfo")
-    print_json(client.get_read_info(target_book_id))
-
-    print_section("GET /web/book/bookmarklist")
-    print_json(client.get_bookmark_list(target_book_id))
-
-    print_section("GET /web/review/list")
-    s, r, p, c = client.get_review_list(target_book_id)
-    print_json({"summary": s, "regular": r, "page": p, "chapter": c})
-
-    print_section("POST /web/book/chapterInfos")
-    print_json(client.get_chapter_info(target_book_id))
-
-    print_section("Processed (get_single_book_data)")
-    book_data = client.get_single_book_data(target_book_id, target_book_item)
-    print_json(book_data)
+    # The endpoint calls are independent, so fire them all at once and print
+    # the sections in their usual order as the results come in.
+    processed_section = "Processed (get_single_book_data)"
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = {
+            "GET /web/book/info": pool.submit(client.get_book_info, target_book_id),
+            "GET /web/book/readinfo": pool.submit(client.get_read_info, target_book_id),
+            "GET /web/book/bookmarklist": pool.submit(client.get_bookmark_list, target_book_id),
+            "GET /web/review/list": pool.submit(client.get_review_list, target_book_id),
+            "POST /web/book/chapterInfos": pool.submit(client.get_chapter_info, target_book_id),
+            processed_section: pool.submit(
+                client.get_single_book_data, target_book_id, target_book_item,
+            ),
+        }
+        for section, future in futures.items():
+            print_section(section)
+            result = future.result()
+            if section == "GET /web/review/list":
+                s, r, p, c = result
+                result = {"summary": s, "regular": r, "page": p, "chapter": c}
+            print_json(result)
+
+    book_data = futures[processed_section].result()
 
     if book_data:
         print_section("Summary")
         pure = sum(1 for b in book_data.get("bookmarks", []) if b.get("reviewId") is None)
         notes = sum(1 for b in book_data.get("bookmarks", []) if b.get("reviewId") is not None)
-        print(f"Title:    {book_data['title']}")
-        print(f"Author:   {book_data['author']}")
-        print(f"Status:   {book_data['status']}")
-        print(f"Pages:    {book_data.get('current_page')}/{book_data.get('total_page')}")
-        print(f"Progress: {book_data.get('percent')}%")
-        print(f"Highlights (划线):  {pure}")
-        print(f"Notes (笔记):       {notes}")
-        print(f"Page notes:         {len(book_data.get('page_notes', []))}")
-        print(f"Chapter notes:      {len(book_data.get('chapter_notes', []))}")
-        print(f"Book reviews:       {len(book_data.get('summary_reviews', []))}")
+        sys.stdout.write("\n".join([
+            f"Title:    {book_data['title']}",
+            f"Author:   {book_data['author']}",
+            f"Status:   {book_data['status']}",
+            f"Pages:    {book_data.get('current_page')}/{book_data.get('total_page')}",
+            f"Progress: {book_data.get('percent')}%",
+            f"Highlights (划线):  {pure}",
+            f"Notes (笔记):       {notes}",
+            f"Page notes:         {len(book_data.get('page_notes', []))}",
+            f"Chapter notes:      {len(book_data.get('chapter_notes', []))}",
+            f"Book reviews:       {len(book_data.get('summary_reviews', []))}",
+        ]) + "\n")
 
 
 if __name__ == "__main__":
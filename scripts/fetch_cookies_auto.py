@@ -21,53 +21,35 @@ from typing import Dict, Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from config import WEREAD_SHELF_API, dequote, env, format_cookies, update_env_file
 
-def update_env_file(cookies_str: str, env_path: Optional[Path] = None) -> bool:
-    """
-    Update .env file with new cookies.
-    If WEREAD_COOKIES exists, replace it. Otherwise, append it.
-    """
-    if env_path is None:
-        env_path = Path(__file__).parent.parent / ".env"
-    
-    if not env_path.exists():
-        print(f"[INFO] Creating .env file at {env_path}")
-        env_path.touch()
-    
-    # Read existing .env content
-    content = env_path.read_text(encoding='utf-8')
-    lines = content.split('\n')
-    
-    # Find and replace WEREAD_COOKIES line
-    updated = False
-    new_lines = []
-    for line in lines:
-        if line.strip().startswith('WEREAD_COOKIES='):
-            # Replace existing
-            new_lines.append(f'WEREAD_COOKIES="{cookies_str}"')
-            updated = True
-        elif line.strip().startswith('#WEREAD_COOKIES='):
-            # Uncomment if commented
-            new_lines.append(f'WEREAD_COOKIES="{cookies_str}"')
-            updated = True
-        else:
-            new_lines.append(line)
-    
-    # If not found, append it
-    if not updated:
-        if content and not content.endswith('\n'):
-            new_lines.append('')
-        new_lines.append(f'WEREAD_COOKIES="{cookies_str}"')
-    
-    # Write back
-    env_path.write_text('\n'.join(new_lines), encoding='utf-8')
-    return True
+# Persistent browser profiles, so a saved login skips the QR-code scan
+BROWSER_STATE_DIR = Path(__file__).parent.parent / ".browser_state"
+SELENIUM_STATE_DIR = Path(__file__).parent.parent / ".browser_state_selenium"
+
+# Authenticated endpoint whose response refreshes the session cookies
+SHELF_SYNC_URL = "https://weread.qq.com/web/shelf/sync?synckey=0&lectureSynckey=0"
+REQUIRED_COOKIES = frozenset({"wr_skey", "wr_vid", "wr_rt"})
 
+# Where the last ChromeDriver path resolved by webdriver-manager is remembered
+CHROMEDRIVER_PATH_CACHE = Path.home() / ".cache" / "weread-cookies" / "chromedriver_path"
 
-def format_cookies(cookie_dict: Dict[str, str]) -> str:
-    """Format cookie dict into cookie string format"""
-    return "; ".join([f"{k}={v}" for k, v in cookie_dict.items()])
+
+def _chromedriver_path(manager_cls, refresh: bool = False) -> str:
+    """Return a ChromeDriver path, only asking webdriver-manager when needed."""
+    if not refresh and CHROMEDRIVER_PATH_CACHE.exists():
+        cached = CHROMEDRIVER_PATH_CACHE.read_text(encoding="utf-8").strip()
+        if cached and Path(cached).exists():
+            return cached
+    path = manager_cls().install()
+    try:
+        CHROMEDRIVER_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        CHROMEDRIVER_PATH_CACHE.write_text(path, encoding="utf-8")
+    except OSError:
+        pass
+    return path
 
 
 def fetch_cookies_selenium() -> Optional[str]:
@@ -82,6 +64,7 @@ def fetch_cookies_selenium() -> Optional[str]:
         from selenium.webdriver.common.by import By
         from selenium.webdriver.support.ui import WebDriverWait
         from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
         from webdriver_manager.chrome import ChromeDriverManager
     except ImportError:
         print("❌ Selenium not installed. Install with: pip install selenium webdriver-manager")
@@ -100,17 +83,24 @@ def fetch_cookies_selenium() -> Optional[str]:
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    # Keep the login between runs, like the Playwright profile
+    chrome_options.add_argument(f"--user-data-dir={SELENIUM_STATE_DIR}")
     
     driver = None
     try:
         # Use webdriver-manager to automatically handle ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        # (the resolved driver path is cached; install() hits the network)
+        try:
+            service = Service(_chromedriver_path(ChromeDriverManager))
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        except SessionNotCreatedException:
+            # Chrome was updated past the cached driver — resolve it again
+            service = Service(_chromedriver_path(ChromeDriverManager, refresh=True))
+            driver = webdriver.Chrome(service=service, options=chrome_options)
         
         # Navigate to WeRead
         print("\n📖 Navigating to weread.qq.com...")
         driver.get("https://weread.qq.com")
-        time.sleep(2)
         
         # Check if already logged in (look for user profile or bookshelf)
         current_url = driver.current_url
@@ -124,49 +114,31 @@ def fetch_cookies_selenium() -> Optional[str]:
             print("   The script will detect when you're logged in.")
             print("   (Waiting up to 60 seconds...)")
             
-            # Check for login indicators
-            logged_in = False
+            # A wr_skey cookie is the login signal (same as the Playwright path).
+            # Poll on a short interval so login is picked up almost immediately.
             max_wait = 60  # seconds
-            start_time = time.time()
-            
-            while time.time() - start_time < max_wait:
-                time.sleep(2)
-                
-                # Check URL - if redirected to main page or shelf, likely logged in
-                current_url = driver.current_url
-                if "weread.qq.com" in current_url and "login" not in current_url.lower():
-                    # Check for user elements or bookshelf
-                    try:
-                        # Look for common logged-in indicators
-                        page_source = driver.page_source.lower()
-                        if any(indicator in page_source for indicator in ["书架", "shelf", "我的", "profile", "用户"]):
-                            logged_in = True
-                            break
-                    except:
-                        pass
-                
-                # Also check cookies - if we have wr_skey, we're likely logged in
-                cookies = driver.get_cookies()
-                cookie_dict = {c['name']: c['value'] for c in cookies}
-                if 'wr_skey' in cookie_dict and cookie_dict['wr_skey']:
-                    logged_in = True
-                    break
-                
-                print(f"   Still waiting... ({int(time.time() - start_time)}s / {max_wait}s)")
+            try:
+                WebDriverWait(driver, max_wait, poll_frequency=0.25).until(
+                    lambda d: any(c['name'] == 'wr_skey' and c['value'] for c in d.get_cookies())
+                )
+                logged_in = True
+            except TimeoutException:
+                logged_in = False
             
             if not logged_in:
                 print("\n⚠️  Timeout waiting for login. Please try again.")
                 return None
             
             print("\n✅ Login detected!")
-            # Wait longer to ensure all cookies are set (some cookies are set after page load)
-            print("   Waiting for all cookies to be set...")
-            time.sleep(5)  # Wait longer for all cookies to be set by the server
             
-            # Navigate to a page that requires auth to trigger cookie refresh
+            # Navigate to a page that requires auth to trigger cookie refresh.
+            # driver.get() returns after the response has set its cookies, so
+            # only wait (briefly) if the required ones are still missing.
             try:
-                driver.get("https://weread.qq.com/web/shelf/sync?synckey=0&lectureSynckey=0")
-                time.sleep(2)
+                driver.get(SHELF_SYNC_URL)
+                WebDriverWait(driver, 10, poll_frequency=0.25).until(
+                    lambda d: REQUIRED_COOKIES <= {c['name'] for c in d.get_cookies()}
+                )
             except:
                 pass
             
@@ -221,7 +193,14 @@ def fetch_cookies_selenium() -> Optional[str]:
             driver.quit()
 
 
-BROWSER_STATE_DIR = Path(__file__).parent.parent / ".browser_state"
+# Login is detected by polling the context cookie jar rather than
+# document.cookie, since the session cookies may be HttpOnly.
+LOGIN_POLL_MS = 250
+
+
+def _has_skey(context) -> bool:
+    """Return True once the browser context holds a non-empty wr_skey cookie."""
+    return any(c["name"] == "wr_skey" and c["value"] for c in context.cookies())
 
 
 def fetch_cookies_playwright(headless: bool = False) -> Optional[str]:
@@ -267,12 +246,9 @@ def fetch_cookies_playwright(headless: bool = False) -> Optional[str]:
             page = context.pages[0] if context.pages else context.new_page()
 
             page.goto("https://weread.qq.com", wait_until="domcontentloaded")
-            time.sleep(2)
 
             # Check if already logged in from saved state
-            cookies = context.cookies()
-            cookie_dict = {c["name"]: c["value"] for c in cookies}
-            logged_in = bool(cookie_dict.get("wr_skey"))
+            logged_in = _has_skey(context)
 
             if not logged_in:
                 if headless:
@@ -282,16 +258,19 @@ def fetch_cookies_playwright(headless: bool = False) -> Optional[str]:
 
                 print("Waiting for QR-code login (up to 120 s) ...")
                 max_wait = 120
-                start_time = time.time()
-                while time.time() - start_time < max_wait:
-                    time.sleep(2)
-                    cookies = context.cookies()
-                    cookie_dict = {c["name"]: c["value"] for c in cookies}
-                    if cookie_dict.get("wr_skey"):
+                start_time = time.monotonic()
+                next_report = 10
+                while time.monotonic() - start_time < max_wait:
+                    # wait_for_timeout keeps Playwright's event loop running,
+                    # unlike time.sleep, so the login redirect is processed.
+                    page.wait_for_timeout(LOGIN_POLL_MS)
+                    if _has_skey(context):
                         logged_in = True
                         break
-                    elapsed = int(time.time() - start_time)
-                    print(f"  Waiting... ({elapsed}s / {max_wait}s)")
+                    elapsed = int(time.monotonic() - start_time)
+                    if elapsed >= next_report:
+                        print(f"  Waiting... ({elapsed}s / {max_wait}s)")
+                        next_report += 10
 
             if not logged_in:
                 print("Timeout waiting for login.")
@@ -299,15 +278,14 @@ def fetch_cookies_playwright(headless: bool = False) -> Optional[str]:
                 return None
 
             print("Login detected — extracting cookies ...")
-            time.sleep(3)
 
-            # Hit shelf to trigger any extra Set-Cookie headers
+            # Hit shelf to trigger any extra Set-Cookie headers; the cookies
+            # are in the jar as soon as that response arrives.
             try:
-                page.goto(
-                    "https://weread.qq.com/web/shelf/sync?synckey=0&lectureSynckey=0",
-                    wait_until="domcontentloaded",
-                )
-                time.sleep(2)
+                with page.expect_response(
+                    lambda r: "shelf/sync" in r.url, timeout=10000,
+                ):
+                    page.goto(SHELF_SYNC_URL, wait_until="commit")
             except Exception:
                 pass
 
@@ -372,15 +350,41 @@ def _push_to_gist(cookies_str: str) -> None:
         print(f"Gist update error: {e}")
 
 
+def cached_cookies_valid() -> bool:
+    """Return True if WEREAD_COOKIES from .env still authenticates against WeRead."""
+    cookies_str = dequote(env("WEREAD_COOKIES"))
+    if not cookies_str:
+        return False
+    try:
+        import requests
+        r = requests.get(
+            WEREAD_SHELF_API,
+            params={"synckey": 0, "lectureSynckey": 0},
+            headers={"Cookie": cookies_str},
+            timeout=5,
+        )
+        return r.status_code == 200 and not r.json().get("errCode")
+    except Exception:
+        return False
+
+
 def main():
     """Main function.
 
     Flags:
         --headless   Reuse saved browser session (no window, no QR scan).
                      Fails if no saved state exists — run interactively first.
+        --force      Open the browser even if the saved cookies still work.
+                     WeReadAPI's auth-failure refresh and the hourly
+                     refresh_and_sync job always pass it.
     """
     headless = "--headless" in sys.argv
 
+    # A single API call is far cheaper than launching a browser
+    if "--force" not in sys.argv and cached_cookies_valid():
+        print("Saved cookies are still valid — nothing to do (use --force to refetch)")
+        return True
+
     if headless:
         print("Cookie refresh (headless) ...")
     else:
@@ -401,7 +405,7 @@ def main():
         return False
 
     env_path = Path(__file__).parent.parent / ".env"
-    if update_env_file(cookies_str, env_path):
+    if update_env_file("WEREAD_COOKIES", cookies_str, env_path):
         print(f"Cookies saved to {env_path}")
         _push_to_gist(cookies_str)
         return True
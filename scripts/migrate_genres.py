@@ -1,18 +1,103 @@
 #!/usr/bin/env python3
 """One-time migration: replace Chinese genre tags with English on all Notion pages."""
 
+import random
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
 from pathlib import Path
+from threading import Lock
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
 
+import httpx
 from config import env, GENRE_MAP, PROP_GENRE
-from notion_client import Client
+from notion_client import APIErrorCode, APIResponseError, Client
+
+# Notion allows an average of 3 requests/s per integration
+REQUESTS_PER_SECOND = 3
+MAX_WORKERS = 8
+MAX_ATTEMPTS = 5
+
+
+class RateLimiter:
+    """Space out calls so that at most `rate` start per second across threads."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def call_with_backoff(limiter: RateLimiter, fn, **kwargs):
+    """Call a Notion endpoint under the rate limiter, backing off on 429s."""
+    for attempt in range(MAX_ATTEMPTS):
+        limiter.acquire()
+        try:
+            return fn(**kwargs)
+        except APIResponseError as e:
+            if e.code != APIErrorCode.RateLimited or attempt == MAX_ATTEMPTS - 1:
+                raise
+            time.sleep(2 ** attempt + random.random())
+
+
+def iter_pages(notion, limiter: RateLimiter, db_id: str, filter: Optional[dict] = None):
+    """
+    Yield database pages one at a time, following the query cursor.
+
+    The next batch is requested in the background while the current one is
+    being consumed, so at most two batches are held in memory at a time.
+    """
+    def query(cursor):
+        kwargs = {"database_id": db_id, "page_size": 100}
+        if filter:
+            kwargs["filter"] = filter
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        return call_with_backoff(limiter, notion.databases.query, **kwargs)
+
+    fetched = 0
+    # Queries get their own worker so they never queue behind page updates
+    with ThreadPoolExecutor(max_workers=1) as fetcher:
+        next_query = fetcher.submit(query, None)
+        while next_query is not None:
+            resp = next_query.result()
+            next_query = (
+                fetcher.submit(query, resp.get("next_cursor"))
+                if resp.get("has_more") else None
+            )
+            fetched += len(resp["results"])
+            print(f"  Fetched {fetched} pages so far...")
+            yield from resp["results"]
+
+
+def update_genres(notion, limiter: RateLimiter, page_id: str, tags: list) -> None:
+    """Replace a page's genre tags (the updated page body is not kept)."""
+    call_with_backoff(
+        limiter, notion.pages.update,
+        page_id=page_id,
+        properties={PROP_GENRE: {"multi_select": [{"name": g} for g in tags]}},
+    )
 
 
 def main():
-    notion = Client(auth=env("NOTION_TOKEN"))
+    # notion-client talks over httpx; size its pool to the update workers (plus
+    # the query worker) so every request reuses a kept-alive connection.
+    pool_size = MAX_WORKERS + 1
+    http = httpx.Client(limits=httpx.Limits(
+        max_connections=pool_size, max_keepalive_connections=pool_size,
+    ))
+    notion = Client(auth=env("NOTION_TOKEN"), client=http)
     db_id = env("NOTION_DATABASE_ID")
 
     db = notion.databases.retrieve(database_id=db_id)
@@ -21,25 +106,26 @@ def main():
         print(f"[ERROR] {PROP_GENRE} is not multi_select — cannot migrate.")
         return
 
-    print("Fetching all pages from Notion...")
-    pages = []
-    cursor = None
-    while True:
-        kwargs = {"database_id": db_id, "page_size": 100}
-        if cursor:
-            kwargs["start_cursor"] = cursor
-        resp = notion.databases.query(**kwargs)
-        pages.extend(resp["results"])
-        print(f"  Fetched {len(pages)} pages so far...")
-        if not resp.get("has_more"):
-            break
-        cursor = resp.get("next_cursor")
-
-    print(f"Total pages: {len(pages)}\n")
-    updated = 0
+    limiter = RateLimiter(REQUESTS_PER_SECOND)
+    # Only pages tagged with at least one Chinese genre need migrating, so let
+    # Notion do the filtering instead of downloading the whole database.
+    genre_filter = {
+        "or": [
+            {"property": PROP_GENRE, "multi_select": {"contains": cn}}
+            for cn in GENRE_MAP
+        ]
+    }
+
+    print("Fetching pages with Chinese genres from Notion...")
+    fetched = 0
     skipped = 0
+    pending = []
 
-    for page in pages:
+    # Read the whole filtered result set before writing anything: an updated
+    # page drops out of the filter, which would shift the query's cursor and
+    # skip pages if updates ran while it was still paginating.
+    for page in iter_pages(notion, limiter, db_id, filter=genre_filter):
+        fetched += 1
         props = page.get("properties", {})
         genre_data = props.get(PROP_GENRE, {})
         if genre_data.get("type") != "multi_select":
@@ -50,10 +136,6 @@ def main():
             continue
 
         current_names = [t["name"] for t in current_tags]
-        has_chinese = any(name in GENRE_MAP for name in current_names)
-        if not has_chinese:
-            skipped += 1
-            continue
 
         title = "?"
         for prop_val in props.values():
@@ -61,18 +143,9 @@ def main():
                 title = prop_val["title"][0].get("plain_text", "?")
                 break
 
-        seen: set[str] = set()
-        new_tags: list[str] = []
-        for name in current_names:
-            if name in GENRE_MAP:
-                for eng in GENRE_MAP[name]:
-                    if eng not in seen:
-                        seen.add(eng)
-                        new_tags.append(eng)
-            else:
-                if name not in seen:
-                    seen.add(name)
-                    new_tags.append(name)
+        new_tags = list(dict.fromkeys(chain.from_iterable(
+            GENRE_MAP.get(name, (name,)) for name in current_names
+        )))
 
         if set(new_tags) == set(current_names):
             skipped += 1
@@ -80,17 +153,23 @@ def main():
 
         print(f"  {title}")
         print(f"    {current_names} → {new_tags}")
+        pending.append((title, page["id"], new_tags))
 
-        time.sleep(0.3)
-        notion.pages.update(
-            page_id=page["id"],
-            properties={
-                PROP_GENRE: {"multi_select": [{"name": g} for g in new_tags]}
-            },
-        )
-        updated += 1
-
-    print(f"\nDone. Updated: {updated}, Skipped (already English): {skipped}")
+    updated = 0
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {
+            pool.submit(update_genres, notion, limiter, page_id, new_tags): title
+            for title, page_id, new_tags in pending
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+                updated += 1
+            except Exception as e:
+                print(f"[ERROR] Failed to update {futures[future]}: {e}")
+
+    print(f"\nTotal pages: {fetched}")
+    print(f"Done. Updated: {updated}, Skipped (unchanged): {skipped}")
 
 
 if __name__ == "__main__":
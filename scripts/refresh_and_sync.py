@@ -4,6 +4,11 @@ Refresh WeRead cookies (headless) and immediately sync to Notion + update heatma
 
 Designed to be called by launchd every hour. Avoids macOS Gatekeeper issues
 that block bash scripts in the Downloads folder.
+
+The refresh always runs with --force. A cookie that passes the shelf check
+now can still expire before the next hourly run, and this job is what keeps
+the Gist copy used by GitHub Actions and Vercel fresh, so it must not take
+fetch_cookies_auto.py's "still valid, nothing to do" shortcut.
 """
 
 import os
@@ -48,7 +53,7 @@ def main():
 
     # Step 1: Refresh cookies (headless)
     ok = run("[1/3] Refreshing cookies...", [
-        PYTHON_BIN, str(PROJECT_DIR / "scripts" / "fetch_cookies_auto.py"), "--headless",
+        PYTHON_BIN, str(PROJECT_DIR / "scripts" / "fetch_cookies_auto.py"), "--headless", "--force",
     ])
     if not ok:
         print("Cookie refresh failed — skipping sync")
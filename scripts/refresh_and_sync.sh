@@ -2,7 +2,7 @@
 set -euo pipefail
 
 # Refresh WeRead cookies (headless) and immediately run the Notion sync
-# while the cookies are guaranteed fresh.
+# while the cookies are guaranteed fresh. --force: see refresh_and_sync.py.
 
 PROJECT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 PYTHON_BIN="$PROJECT_DIR/.venv/bin/python3"
@@ -17,7 +17,7 @@ echo "=== $(date '+%Y-%m-%d %H:%M:%S') Cookie refresh + sync ==="
 
 # Step 1: Refresh cookies
 echo "[1/2] Refreshing cookies..."
-"$PYTHON_BIN" "$PROJECT_DIR/scripts/fetch_cookies_auto.py" --headless
+"$PYTHON_BIN" "$PROJECT_DIR/scripts/fetch_cookies_auto.py" --headless --force
 if [ $? -ne 0 ]; then
   echo "Cookie refresh failed — skipping sync"
   exit 1
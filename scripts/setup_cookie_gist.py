@@ -26,6 +26,7 @@ except ImportError:
     import requests
 
 from dotenv import load_dotenv
+from config import dequote, update_env_file
 
 def main():
     # Load .env
@@ -50,8 +51,7 @@ def main():
         return 1
     
     # Clean cookies string
-    if cookies.startswith('"') and cookies.endswith('"'):
-        cookies = cookies[1:-1]
+    cookies = dequote(cookies)
     
     print("Creating private GitHub Gist for cookies...")
     
@@ -83,12 +83,14 @@ def main():
         print(f"   URL: {gist_url}")
         print()
         
-        # Update .env file
-        content = env_path.read_text(encoding='utf-8')
-        if 'COOKIE_GIST_ID=' not in content:
-            with open(env_path, 'a') as f:
+        # Update .env file: replace an existing (or commented-out) entry in
+        # place, or append a first-time entry with its heading in one write
+        if 'COOKIE_GIST_ID=' in env_path.read_text(encoding='utf-8'):
+            update_env_file("COOKIE_GIST_ID", gist_id, env_path)
+        else:
+            with open(env_path, 'a', encoding='utf-8') as f:
                 f.write(f'\n# GitHub Gist for cookie sync\nCOOKIE_GIST_ID="{gist_id}"\n')
-            print("✅ Added COOKIE_GIST_ID to .env")
+        print("✅ Saved COOKIE_GIST_ID to .env")
         
         print()
         print("📋 Add these secrets to GitHub (Settings → Secrets → Actions):")
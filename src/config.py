@@ -10,28 +10,112 @@ This module provides:
 - Common configuration constants
 """
 
+import functools
 import os
+import re
+import shutil
+import tempfile
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
-# Load .env file if it exists
-try:
-    from dotenv import load_dotenv
-    ENV_PATH = Path(__file__).parent.parent / ".env"
-    if ENV_PATH.exists():
-        load_dotenv(ENV_PATH)
-except ImportError:
-    ENV_PATH = Path(__file__).parent.parent / ".env"
+# Resolved once with os.path (plain string ops) rather than chained Path.parent
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_PATH = Path(os.path.join(_ROOT, ".env"))
+
+# The .env file is only read the first time a variable turns out to be
+# missing, so processes whose environment is fully provided (CI, Vercel,
+# systemd) never touch it or import python-dotenv.
+_dotenv_loaded = False
+_dotenv_lock = threading.Lock()
+
+
+def _load_dotenv_once() -> None:
+    global _dotenv_loaded
+    # The flag is only set once load_dotenv() has returned, so a thread that
+    # arrives mid-load waits on the lock instead of reading a half-loaded env
+    with _dotenv_lock:
+        if _dotenv_loaded:
+            return
+        try:
+            from dotenv import load_dotenv
+        except ImportError:
+            pass
+        else:
+            if ENV_PATH.exists():
+                load_dotenv(ENV_PATH)
+        _dotenv_loaded = True
 
 
 def env(name: str, default: Optional[str] = None) -> str:
-    """Get environment variable with optional default."""
+    """Get environment variable with optional default (cached per name/default)."""
+    return _env_cached(name, default)
+
+
+# Bumped by clear_env_cache(), so caches built from env() values elsewhere
+# can key on it and go stale together with env()'s own cache
+_env_generation = 0
+
+
+def clear_env_cache() -> None:
+    """Forget cached env() values; call after changing os.environ at runtime."""
+    global _env_generation
+    _env_generation += 1
+    _env_cached.cache_clear()
+
+
+def env_generation() -> int:
+    """Counter that changes whenever clear_env_cache() runs."""
+    return _env_generation
+
+
+@functools.lru_cache(maxsize=None)
+def _env_cached(name: str, default: Optional[str]) -> str:
     v = os.environ.get(name)
-    if v is None or str(v).strip() == "":
-        if default is None:
-            return ""
-        return default
-    return str(v).strip()
+    if v is None and not _dotenv_loaded:
+        _load_dotenv_once()
+        v = os.environ.get(name)
+    # os.environ values are already str; strip once, and only if non-empty
+    v = v.strip() if v else ""
+    return v or default or ""
+
+
+# Env flag spellings, shared so every entry point agrees on them
+TRUTHY_VALUES = frozenset({"1", "true", "yes"})
+DISABLED_VALUES = frozenset({"", "none", "null", "false", "off", "disable", "0"})
+
+
+def dequote(value: str) -> str:
+    """Strip surrounding whitespace and one pair of matching quotes."""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def first_value(d: Dict, *keys: str, default=None):
+    """
+    Return the first truthy ``d[key]`` among ``keys`` (``a.get(x) or a.get(y)``).
+
+    Args:
+        d: Mapping to look in
+        keys: Keys to try, in order
+        default: Returned when none of the keys has a truthy value
+    """
+    for key in keys:
+        value = d.get(key)
+        if value:
+            return value
+    return default
+
+
+@functools.lru_cache(maxsize=32)
+def _env_keys_pattern(keys: tuple[str, ...]) -> "re.Pattern[str]":
+    """Compiled matcher for the KEY= (or #KEY=) lines of the given keys."""
+    # [^\r\n]* rather than .* so a CRLF line keeps its \r
+    return re.compile(
+        rf'^[ \t]*#?({"|".join(map(re.escape, keys))})=[^\r\n]*', re.MULTILINE,
+    )
 
 
 def update_env_file(key: str, value: str, env_path: Optional[Path] = None) -> bool:
@@ -44,6 +128,20 @@ def update_env_file(key: str, value: str, env_path: Optional[Path] = None) -> bo
         value: Value to set (will be quoted)
         env_path: Path to .env file (defaults to project root)
     
+    Returns:
+        True if successful
+    """
+    return update_env_file_many({key: value}, env_path)
+
+
+def update_env_file_many(pairs: Dict[str, str], env_path: Optional[Path] = None) -> bool:
+    """
+    Update several keys in the .env file with one read and one write.
+    
+    Args:
+        pairs: Mapping of environment variable names to values (will be quoted)
+        env_path: Path to .env file (defaults to project root)
+    
     Returns:
         True if successful
     """
@@ -54,49 +152,90 @@ def update_env_file(key: str, value: str, env_path: Optional[Path] = None) -> bo
         print(f"[CONFIG] Creating .env file at {env_path}")
         env_path.touch()
     
-    # Read existing .env content
-    content = env_path.read_text(encoding='utf-8')
-    lines = content.split('\n')
+    # newline='' everywhere so CRLF files are neither translated nor mixed
+    with env_path.open(encoding='utf-8', newline='') as f:
+        content = f.read()
+    lines = {key: f'{key}="{value}"' for key, value in pairs.items()}
+    found = set()
     
-    # Find and replace the key
-    updated = False
-    new_lines = []
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith(f'{key}=') or stripped.startswith(f'#{key}='):
-            # Replace existing (or uncomment if commented)
-            new_lines.append(f'{key}="{value}"')
-            updated = True
-        else:
-            new_lines.append(line)
+    def substitute(match):
+        key = match.group(1)
+        found.add(key)
+        return lines[key]
+    
+    # Replace existing (or uncomment if commented) lines for every key in a
+    # single pass over the text. A plain substring check first keeps keys
+    # that can't be in the file (the usual first-save case) off the regex.
+    present = tuple(key for key in lines if f'{key}=' in content)
+    if present:
+        new_content, count = _env_keys_pattern(present).subn(substitute, content)
+    else:
+        new_content, count = content, 0
+    replaced = count > 0
+    missing = [line for key, line in lines.items() if key not in found]
     
-    # If not found, append it
-    if not updated:
-        if content and not content.endswith('\n'):
-            new_lines.append('')
-        new_lines.append(f'{key}="{value}"')
+    tail = ""
+    if missing:
+        # Appended lines follow the file's existing line endings
+        newline = "\r\n" if "\r\n" in content else "\n"
+        sep = newline if new_content and not new_content.endswith("\n") else ""
+        tail = sep + newline.join(missing) + newline
     
-    # Write back
-    env_path.write_text('\n'.join(new_lines), encoding='utf-8')
+    if replaced:
+        # Write a sibling temp file and swap it in, so a crash mid-write
+        # can never leave a truncated .env behind
+        with tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', newline='', dir=env_path.parent, delete=False,
+        ) as tmp:
+            tmp.write(new_content)
+            tmp.write(tail)
+        shutil.copymode(env_path, tmp.name)
+        os.replace(tmp.name, env_path)
+    elif tail:
+        # Nothing to replace, so append without rewriting the rest of the file
+        with env_path.open('a', encoding='utf-8', newline='') as f:
+            f.write(tail)
     return True
 
 
-def format_cookies(cookie_dict: dict) -> str:
-    """Format cookie dictionary as cookie string."""
-    return "; ".join(f"{k}={v}" for k, v in sorted(cookie_dict.items()))
+def format_cookies(cookie_dict: dict, sort: bool = False) -> str:
+    """
+    Format cookie dictionary as cookie string.
+    
+    Args:
+        cookie_dict: Cookie names mapped to values
+        sort: Order by cookie name (memoized) instead of insertion order
+    """
+    # join() materializes a generator into a list anyway, so pass it a list
+    if sort:
+        return _format_cookies_sorted(frozenset(cookie_dict.items()))
+    return "; ".join([f"{k}={v}" for k, v in cookie_dict.items()])
+
+
+@functools.lru_cache(maxsize=16)
+def _format_cookies_sorted(items: frozenset) -> str:
+    # An unchanged cookie jar skips the sort and join entirely
+    return "; ".join([f"{k}={v}" for k, v in sorted(items)])
+
+
+_COOKIE_PARSE_CACHE: dict[str, dict] = {}
 
 
 def parse_cookies(cookie_str: str) -> dict:
-    """Parse cookie string into dictionary."""
-    cookies = {}
+    """Parse cookie string into dictionary (memoized per cookie string)."""
     if not cookie_str:
-        return cookies
-    for pair in cookie_str.split(";"):
-        pair = pair.strip()
-        if "=" in pair:
-            key, value = pair.split("=", 1)
-            cookies[key.strip()] = value.strip()
-    return cookies
+        return {}
+    cached = _COOKIE_PARSE_CACHE.get(cookie_str)
+    if cached is None:
+        cached = {}
+        for pair in cookie_str.split(";"):
+            key, sep, value = pair.partition("=")
+            key = key.strip()
+            if sep and key:
+                cached[key] = value.strip()
+        _COOKIE_PARSE_CACHE[cookie_str] = cached
+    # Callers may mutate the result, so never hand out the cached dict itself
+    return dict(cached)
 
 
 # WeRead API endpoints (only the ones that actually exist)
@@ -109,90 +248,106 @@ WEREAD_REVIEW_LIST_API = f"{WEREAD_API_BASE}/web/review/list"
 WEREAD_CHAPTER_INFO_API = f"{WEREAD_API_BASE}/web/book/chapterInfos"
 WEREAD_RENEW_URL = f"{WEREAD_API_BASE}/web/login/renewal"
 
-# Notion property names (configurable via env)
-PROP_TITLE = env("NOTION_TITLE_PROP", "Name")
-PROP_AUTHOR = env("PROP_AUTHOR", "Author")
-PROP_STATUS = env("PROP_STATUS", "Status")
-PROP_CURRENT_PAGE = env("PROP_CURRENT_PAGE", "Current Page")
-PROP_TOTAL_PAGE = env("PROP_TOTAL_PAGE", "Total Page")
-PROP_DATE_FINISHED = env("PROP_DATE_FINISHED", "Date Finished")
-PROP_SOURCE = env("PROP_SOURCE", "Source")
-PROP_STARTED_AT = env("PROP_STARTED_AT", "Date Started")
-PROP_LAST_READ_AT = env("PROP_LAST_READ_AT", "Last Read At")
-PROP_COVER_IMAGE = env("PROP_COVER_IMAGE", "Cover Image")
-PROP_GENRE = env("PROP_GENRE", "Genre")
-PROP_YEAR_STARTED = env("PROP_YEAR_STARTED", "Year Started")
-PROP_RATING = env("PROP_RATING", "Rating")
-PROP_REVIEW = env("PROP_REVIEW", "Review")
-
-# Status values (configurable via env)
-STATUS_TBR = env("STATUS_TBR", "To Be Read")
-STATUS_READING = env("STATUS_READING", "Currently Reading")
-STATUS_READ = env("STATUS_READ", "Read")
-
-# Source identifier
-SOURCE_WEREAD = env("SOURCE_WEREAD", "WeRead")
+# Env-configurable names: constant -> (env var, default). Each is resolved
+# on first access by __getattr__ below and then cached as a module global,
+# so importing config doesn't read the environment for all of them.
+_ENV_CONSTANTS: Dict[str, tuple[str, str]] = {
+    # Notion property names
+    "PROP_TITLE": ("NOTION_TITLE_PROP", "Name"),
+    "PROP_AUTHOR": ("PROP_AUTHOR", "Author"),
+    "PROP_STATUS": ("PROP_STATUS", "Status"),
+    "PROP_CURRENT_PAGE": ("PROP_CURRENT_PAGE", "Current Page"),
+    "PROP_TOTAL_PAGE": ("PROP_TOTAL_PAGE", "Total Page"),
+    "PROP_DATE_FINISHED": ("PROP_DATE_FINISHED", "Date Finished"),
+    "PROP_SOURCE": ("PROP_SOURCE", "Source"),
+    "PROP_STARTED_AT": ("PROP_STARTED_AT", "Date Started"),
+    "PROP_LAST_READ_AT": ("PROP_LAST_READ_AT", "Last Read At"),
+    "PROP_COVER_IMAGE": ("PROP_COVER_IMAGE", "Cover Image"),
+    "PROP_GENRE": ("PROP_GENRE", "Genre"),
+    "PROP_YEAR_STARTED": ("PROP_YEAR_STARTED", "Year Started"),
+    "PROP_RATING": ("PROP_RATING", "Rating"),
+    "PROP_REVIEW": ("PROP_REVIEW", "Review"),
+    # Status values
+    "STATUS_TBR": ("STATUS_TBR", "To Be Read"),
+    "STATUS_READING": ("STATUS_READING", "Currently Reading"),
+    "STATUS_READ": ("STATUS_READ", "Read"),
+    # Source identifier
+    "SOURCE_WEREAD": ("SOURCE_WEREAD", "WeRead"),
+}
+
+
+def __getattr__(name: str) -> str:
+    spec = _ENV_CONSTANTS.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = env(*spec)
+    return value
 
 # WeRead Chinese category → English genre mapping.
-# Each Chinese category maps to a list of English genre tags (multi-select).
+# Each Chinese category maps to a tuple of English genre tags (multi-select).
 # Existing Notion genres are reused exactly as-is.
-GENRE_MAP: dict[str, list[str]] = {
-    "个人成长-人在职场":   ["Career", "Self-Help"],
-    "个人成长-人生哲学":   ["Philosophy", "Self-Help"],
-    "个人成长-励志成长":   ["Self-Help"],
-    "个人成长-沟通表达":   ["Communication", "Self-Help"],
-    "个人成长-认知思维":   ["Psychology", "Self-Help"],
-    "人物传记-传记综合":   ["Biography"],
-    "人物传记-军政领袖":   ["Biography", "Politics"],
-    "人物传记-财经人物":   ["Biography", "Business"],
-    "医学健康-健康":      ["Health"],
-    "医学健康-医学":      ["Medicine"],
-    "历史-历史读物":      ["History"],
-    "哲学宗教-哲学读物":   ["Philosophy"],
-    "哲学宗教-宗教":      ["Religion"],
-    "哲学宗教-西方哲学":   ["Philosophy"],
-    "心理-发展心理学":    ["Psychology"],
-    "心理-心理学应用":    ["Psychology"],
-    "心理-心理学研究":    ["Psychology"],
-    "心理-社会心理学":    ["Psychology", "Sociology"],
-    "心理-积极心理学":    ["Psychology", "Self-Help"],
-    "心理-认知与行为":    ["Psychology"],
-    "政治军事-政治":      ["Politics"],
-    "文学-世界名著":      ["Literary Classics"],
-    "文学-外国文学":      ["Literature"],
-    "文学-散文杂著":      ["Essays"],
-    "文学-现代诗歌":      ["Poetry"],
-    "文学-经典作品":      ["Literary Classics"],
-    "社会文化-文化":      ["Culture"],
-    "社会文化-社科":      ["Social Science"],
-    "科学技术-科学科普":   ["Popular Science"],
-    "科学技术-自然科学":   ["Natural Science"],
-    "精品小说-年代小说":   ["Historical fiction"],
-    "精品小说-影视原著":   ["Fiction"],
-    "精品小说-悬疑推理":   ["Thriller / Mystery"],
-    "精品小说-治愈小说":   ["Fiction"],
-    "精品小说-社会小说":   ["Literary Fiction"],
-    "精品小说-科幻小说":   ["Sci-Fi"],
-    "精品小说-青春文学":   ["Young Adult"],
-    "经济理财-商业":      ["Business"],
-    "经济理财-理财":      ["Finance", "Personal Finance"],
-    "经济理财-管理":      ["Management"],
-    "经济理财-财经":      ["Economics", "Finance"],
-    "艺术-设计":         ["Design"],
-    "计算机-编程设计":    ["Programming"],
+GENRE_MAP: dict[str, tuple[str, ...]] = {
+    "个人成长-人在职场":   ("Career", "Self-Help"),
+    "个人成长-人生哲学":   ("Philosophy", "Self-Help"),
+    "个人成长-励志成长":   ("Self-Help",),
+    "个人成长-沟通表达":   ("Communication", "Self-Help"),
+    "个人成长-认知思维":   ("Psychology", "Self-Help"),
+    "人物传记-传记综合":   ("Biography",),
+    "人物传记-军政领袖":   ("Biography", "Politics"),
+    "人物传记-财经人物":   ("Biography", "Business"),
+    "医学健康-健康":      ("Health",),
+    "医学健康-医学":      ("Medicine",),
+    "历史-历史读物":      ("History",),
+    "哲学宗教-哲学读物":   ("Philosophy",),
+    "哲学宗教-宗教":      ("Religion",),
+    "哲学宗教-西方哲学":   ("Philosophy",),
+    "心理-发展心理学":    ("Psychology",),
+    "心理-心理学应用":    ("Psychology",),
+    "心理-心理学研究":    ("Psychology",),
+    "心理-社会心理学":    ("Psychology", "Sociology"),
+    "心理-积极心理学":    ("Psychology", "Self-Help"),
+    "心理-认知与行为":    ("Psychology",),
+    "政治军事-政治":      ("Politics",),
+    "文学-世界名著":      ("Literary Classics",),
+    "文学-外国文学":      ("Literature",),
+    "文学-散文杂著":      ("Essays",),
+    "文学-现代诗歌":      ("Poetry",),
+    "文学-经典作品":      ("Literary Classics",),
+    "社会文化-文化":      ("Culture",),
+    "社会文化-社科":      ("Social Science",),
+    "科学技术-科学科普":   ("Popular Science",),
+    "科学技术-自然科学":   ("Natural Science",),
+    "精品小说-年代小说":   ("Historical fiction",),
+    "精品小说-影视原著":   ("Fiction",),
+    "精品小说-悬疑推理":   ("Thriller / Mystery",),
+    "精品小说-治愈小说":   ("Fiction",),
+    "精品小说-社会小说":   ("Literary Fiction",),
+    "精品小说-科幻小说":   ("Sci-Fi",),
+    "精品小说-青春文学":   ("Young Adult",),
+    "经济理财-商业":      ("Business",),
+    "经济理财-理财":      ("Finance", "Personal Finance"),
+    "经济理财-管理":      ("Management",),
+    "经济理财-财经":      ("Economics", "Finance"),
+    "艺术-设计":         ("Design",),
+    "计算机-编程设计":    ("Programming",),
 }
 
 
+@functools.lru_cache(maxsize=512)
+def _translate_titles(titles: tuple[str, ...]) -> tuple[str, ...]:
+    # dict.fromkeys dedupes while keeping first-seen order
+    return tuple(dict.fromkeys(
+        eng for title in titles for eng in GENRE_MAP.get(title, ())
+    ))
+
+
 def translate_genres(categories: list[dict] | None) -> list[str]:
     """Translate WeRead category dicts into deduplicated English genre tags."""
     if not categories:
         return []
-    seen: set[str] = set()
-    result: list[str] = []
-    for cat in categories:
-        title = cat.get("title", "")
-        for eng in GENRE_MAP.get(title, []):
-            if eng not in seen:
-                seen.add(eng)
-                result.append(eng)
-    return result
+    # Most books have exactly one category, whose tags are already unique
+    if len(categories) == 1:
+        return list(GENRE_MAP.get(categories[0].get("title", ""), ()))
+    # Books on a shelf share a handful of category combinations, so the
+    # mapping is memoized on the tuple of titles.
+    return list(_translate_titles(tuple(cat.get("title", "") for cat in categories)))
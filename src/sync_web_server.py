@@ -6,13 +6,16 @@ Web server to trigger WeRead -> Notion sync via HTTP endpoint
 Can be embedded in Notion or accessed from anywhere via URL
 """
 
+import functools
+import gzip
 import os
+import string
 import sys
 import json
 import time
 import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, NamedTuple, Optional
 from datetime import datetime
 
 # Add parent directory to path
@@ -27,16 +30,37 @@ except ImportError:
     from flask import Flask, request, jsonify, Response
     from flask_cors import CORS
 
+from markupsafe import escape
 from notion_client import Client
-from config import env
+from config import ENV_PATH, clear_env_cache, env, env_generation, DISABLED_VALUES, TRUTHY_VALUES
 from weread_api import WeReadAPI
 from weread_notion_sync import get_db_properties
 from weread_notion_sync_api import sync_books_from_api
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
+if orjson is not None:
+    from flask.json.provider import DefaultJSONProvider
+
+    class OrjsonProvider(DefaultJSONProvider):
+        """Serialize jsonify() responses with orjson instead of the stdlib encoder."""
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(orjson.dumps(obj), mimetype=self.mimetype)
+
+    app.json = OrjsonProvider(app)
+app.json.sort_keys = False  # Status payloads don't need key sorting on every response
 CORS(app)  # Allow cross-origin requests (for Notion embeds)
 
-# Global state for sync status
+# Global state for sync status. The dict is never mutated: writers publish a
+# new one through _update_status() and readers just take the current
+# reference (rebinding a global is atomic), so status polls never wait on the
+# sync thread.
 sync_status = {
     "running": False,
     "started_at": None,
@@ -51,91 +75,152 @@ sync_status = {
     "error": None
 }
 
+# Serializes writers only (the start check and the status updates)
 sync_lock = threading.Lock()
+# Notified (under sync_lock) whenever a new snapshot is published; together
+# with the version counter it lets /status/wait block until the status moves.
+status_changed = threading.Condition(sync_lock)
+status_version = 0
 
+# Longest a /status/wait request blocks before answering with the old status
+STATUS_WAIT_SECONDS = 25
+
+def _server_threads(default: int = 8) -> int:
+    """SYNC_SERVER_THREADS as a positive int; malformed values fall back to the default."""
+    raw = env("SYNC_SERVER_THREADS")
+    try:
+        threads = int(raw) if raw else default
+    except ValueError:
+        print(f"⚠️  Ignoring invalid SYNC_SERVER_THREADS={raw!r}, using {default}")
+        threads = default
+    return max(1, threads)
+
+
+# Worker threads for waitress; see run_server()
+SERVER_THREADS = _server_threads()
+# A waiting long-poll holds a worker thread, so only this many may wait at
+# once; the rest of the pool stays free for /sync, /trigger and /health.
+# Requests over the limit get the current status at once plus retry_after.
+# Always at least one, so long-polling keeps working on tiny pools.
+STATUS_WAITERS = max(1, SERVER_THREADS - 4)
+STATUS_RETRY_AFTER_SECONDS = 2
+_status_waiters = threading.BoundedSemaphore(STATUS_WAITERS)
+
+
+def _publish_status(snapshot: Dict[str, Any]) -> None:
+    """Install ``snapshot`` and wake long-pollers (caller holds sync_lock)."""
+    global sync_status, status_version
+    sync_status = snapshot
+    status_version += 1
+    status_changed.notify_all()
 
-def get_env_config():
-    """Load configuration from environment"""
-    return {
-        "notion_token": env("NOTION_TOKEN"),
-        "notion_database_id": env("NOTION_DATABASE_ID"),
-        "weread_cookies": env("WEREAD_COOKIES"),
-        "api_key": env("SYNC_API_KEY", ""),  # Optional API key for security
-        "sync_limit": env("SYNC_LIMIT"),
-        "test_book_title": env("WEREAD_TEST_BOOK_TITLE"),
-    }
+
+def _update_status(**changes) -> None:
+    """Publish a new status snapshot with ``changes`` applied."""
+    with sync_lock:
+        _publish_status({**sync_status, **changes})
+
+
+class ServerConfig(NamedTuple):
+    notion_token: str
+    notion_database_id: str
+    weread_cookies: str
+    api_key: str  # Optional API key for security
+    sync_limit: str
+    test_book_title: str
+
+
+def get_env_config() -> ServerConfig:
+    """
+    Configuration from the environment, rebuilt only after clear_env_cache()
+    (a browser cookie refresh in WeReadAPI, or POST /admin/reload).
+    """
+    return _load_env_config(env_generation())
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env_config(generation: int) -> ServerConfig:
+    return ServerConfig(
+        notion_token=env("NOTION_TOKEN"),
+        notion_database_id=env("NOTION_DATABASE_ID"),
+        weread_cookies=env("WEREAD_COOKIES"),
+        api_key=env("SYNC_API_KEY", ""),
+        sync_limit=env("SYNC_LIMIT"),
+        test_book_title=env("WEREAD_TEST_BOOK_TITLE"),
+    )
 
 
 def run_sync_in_thread():
     """Run sync in a separate thread"""
-    global sync_status
-    
     with sync_lock:
         if sync_status["running"]:
             return {"error": "Sync already running"}
-        sync_status["running"] = True
-        sync_status["started_at"] = datetime.now().isoformat()
-        sync_status["completed_at"] = None
-        sync_status["error"] = None
-        sync_status["message"] = "Starting sync..."
-        sync_status["progress"] = {"total": 0, "processed": 0, "synced": 0, "errors": 0}
+        _publish_status({
+            **sync_status,
+            "running": True,
+            "started_at": datetime.now().isoformat(),
+            "completed_at": None,
+            "error": None,
+            "message": "Starting sync...",
+            "progress": {"total": 0, "processed": 0, "synced": 0, "errors": 0},
+        })
     
     try:
         config = get_env_config()
         
-        if not config["notion_token"] or not config["notion_database_id"]:
+        if not config.notion_token or not config.notion_database_id:
             raise ValueError("Missing NOTION_TOKEN or NOTION_DATABASE_ID")
-        if not config["weread_cookies"]:
+        if not config.weread_cookies:
             raise ValueError("Missing WEREAD_COOKIES")
         
-        notion = Client(auth=config["notion_token"])
-        db_props = get_db_properties(notion, config["notion_database_id"])
+        notion = Client(auth=config.notion_token)
+        db_props = get_db_properties(notion, config.notion_database_id)
         
         limit = None
-        if config["sync_limit"]:
+        if config.sync_limit:
             try:
-                limit = int(config["sync_limit"])
+                limit = int(config.sync_limit)
                 if limit <= 0:
                     limit = None
             except ValueError:
                 limit = None
         
-        test_book_title = config["test_book_title"]
-        if test_book_title and test_book_title.lower() in ("none", "null", "false", "off", "disable", "0"):
+        test_book_title = config.test_book_title
+        if test_book_title and test_book_title.lower() in DISABLED_VALUES:
             test_book_title = None
         
-        with sync_lock:
-            sync_status["message"] = "Fetching books from WeRead..."
+        _update_status(message="Fetching books from WeRead...")
         
         # Run the sync
         sync_books_from_api(
             notion, 
-            config["notion_database_id"], 
+            config.notion_database_id, 
             db_props, 
-            config["weread_cookies"],
+            config.weread_cookies,
             limit=limit,
             test_book_title=test_book_title
         )
         
-        with sync_lock:
-            sync_status["running"] = False
-            sync_status["completed_at"] = datetime.now().isoformat()
-            sync_status["message"] = "Sync completed successfully"
+        _update_status(
+            running=False,
+            completed_at=datetime.now().isoformat(),
+            message="Sync completed successfully",
+        )
             
     except Exception as e:
-        with sync_lock:
-            sync_status["running"] = False
-            sync_status["completed_at"] = datetime.now().isoformat()
-            sync_status["error"] = str(e)
-            sync_status["message"] = f"Sync failed: {str(e)}"
+        _update_status(
+            running=False,
+            completed_at=datetime.now().isoformat(),
+            error=str(e),
+            message=f"Sync failed: {str(e)}",
+        )
         import traceback
         traceback.print_exc()
 
 
-@app.route("/", methods=["GET"])
-def index():
-    """Home page with instructions"""
-    html = """
+# Static page bodies are built once at import. The home page only varies by
+# host URL, so it is kept pre-split around that placeholder.
+_INDEX_PAGE_PARTS = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -162,24 +247,30 @@ def index():
         <div class="endpoint">
             <h3>GET /status</h3>
             <p>Get current sync status</p>
-            <div class="code">curl {request.host_url}status</div>
+            <div class="code">curl {host_url}status</div>
+        </div>
+        
+        <div class="endpoint">
+            <h3>GET /status/wait?since=N</h3>
+            <p>Wait (up to 25s) until the status version differs from N, then return it. When too many clients are already waiting it answers at once with <code>retry_after</code> (seconds).</p>
+            <div class="code">curl "{host_url}status/wait?since=0"</div>
         </div>
         
         <div class="endpoint">
             <h3>POST /sync</h3>
             <p>Trigger a sync (starts in background)</p>
-            <div class="code">curl -X POST {request.host_url}sync</div>
+            <div class="code">curl -X POST {host_url}sync</div>
         </div>
         
         <div class="endpoint">
             <h3>GET /sync</h3>
             <p>Trigger a sync and wait for completion (returns JSON)</p>
-            <div class="code">curl {request.host_url}sync</div>
+            <div class="code">curl {host_url}sync</div>
         </div>
         
         <h2>For Notion</h2>
         <p>You can embed this in Notion by creating a web bookmark or using the URL:</p>
-        <div class="code">{request.host_url}sync</div>
+        <div class="code">{host_url}sync</div>
         
         <p>Or create a button that calls the endpoint via a webhook/integration.</p>
         
@@ -188,85 +279,119 @@ def index():
         <a href="/sync" class="button">🔄 Trigger Sync Now</a>
         
         <script>
-            function updateStatus() {{
-                fetch('/status')
+            let version = -1;
+            function updateStatus() {
+                // Long-poll: the server answers as soon as the status changes
+                fetch('/status/wait?since=' + version)
                     .then(r => r.json())
-                    .then(data => {{
+                    .then(payload => {
+                        version = payload.version;
+                        const data = payload.status;
                         const statusDiv = document.getElementById('status');
                         let className = 'status';
                         let text = '';
                         
-                        if (data.running) {{
+                        if (data.running) {
                             className += ' running';
-                            text = `🔄 Running: ${{data.message}}`;
-                        }} else if (data.error) {{
+                            text = `🔄 Running: ${data.message}`;
+                        } else if (data.error) {
                             className += ' error';
-                            text = `❌ Error: ${{data.error}}`;
-                        }} else if (data.completed_at) {{
+                            text = `❌ Error: ${data.error}`;
+                        } else if (data.completed_at) {
                             className += ' success';
-                            text = `✅ Completed: ${{data.message}}`;
-                        }} else {{
-                            text = `⏸️ Ready: ${{data.message}}`;
-                        }}
+                            text = `✅ Completed: ${data.message}`;
+                        } else {
+                            text = `⏸️ Ready: ${data.message}`;
+                        }
                         
                         statusDiv.className = className;
                         statusDiv.textContent = text;
-                    }})
-                    .catch(e => {{
+                        // A busy server answers at once and asks us to back off
+                        if (payload.retry_after) {
+                            setTimeout(updateStatus, payload.retry_after * 1000);
+                        } else {
+                            updateStatus();
+                        }
+                    })
+                    .catch(e => {
                         document.getElementById('status').textContent = 'Error loading status';
-                    }});
-            }}
+                        setTimeout(updateStatus, 2000); // Retry after 2 seconds
+                    });
+            }
             
             updateStatus();
-            setInterval(updateStatus, 2000); // Update every 2 seconds
         </script>
     </body>
     </html>
-    """
-    return html.format(request=request)
+    """.split("{host_url}")
+
+
+@functools.lru_cache(maxsize=8)
+def _index_page(host_url: str) -> tuple:
+    """(UTF-8 body, gzipped body) of the home page for one host URL"""
+    body = str(escape(host_url)).join(_INDEX_PAGE_PARTS).encode("utf-8")
+    return body, gzip.compress(body, compresslevel=9)
+
+
+@app.route("/", methods=["GET"])
+def index():
+    """Home page with instructions"""
+    body, body_gz = _index_page(request.host_url)
+    if request.accept_encodings["gzip"]:
+        return Response(body_gz, mimetype="text/html", headers={
+            "Content-Encoding": "gzip",
+            "Vary": "Accept-Encoding",
+        })
+    return Response(body, mimetype="text/html", headers={"Vary": "Accept-Encoding"})
+
+
+# (snapshot, serialized body) of the last /status response. Snapshots are
+# immutable, so the body stays valid until the sync thread publishes a new
+# one; pollers between updates share a single serialization.
+_status_body: tuple = (None, b"")
 
 
 @app.route("/status", methods=["GET"])
 def status():
     """Get current sync status"""
-    with sync_lock:
-        return jsonify(sync_status)
+    global _status_body
+    snapshot = sync_status
+    cached, body = _status_body
+    if cached is not snapshot:
+        body = orjson.dumps(snapshot) if orjson is not None else app.json.dumps(snapshot)
+        _status_body = (snapshot, body)
+    return Response(body, mimetype="application/json")
 
 
-@app.route("/sync", methods=["GET", "POST"])
-def sync():
-    """Trigger sync - GET returns HTML, POST returns JSON"""
-    global sync_status
-    
-    # Optional API key check
-    config = get_env_config()
-    if config["api_key"]:
-        provided_key = request.args.get("key") or request.headers.get("X-API-Key")
-        if provided_key != config["api_key"]:
-            return jsonify({"error": "Invalid API key"}), 401
-    
-    # Check if already running
-    with sync_lock:
-        if sync_status["running"]:
-            if request.method == "GET":
-                return f"""
-                <html><body>
-                    <h1>Sync Already Running</h1>
-                    <p>Sync is currently in progress. Please wait.</p>
-                    <p><a href="/status">Check Status</a></p>
-                    <script>setTimeout(() => window.location.href = '/status', 2000);</script>
-                </body></html>
-                """, 200
-            else:
-                return jsonify({"error": "Sync already running", "status": sync_status}), 409
-    
-    # Start sync in background thread
-    thread = threading.Thread(target=run_sync_in_thread, daemon=True)
-    thread.start()
-    
-    if request.method == "GET":
-        # Return HTML page that auto-refreshes
-        return f"""
+@app.route("/status/wait", methods=["GET"])
+def status_wait():
+    """Long-poll: return the status once its version differs from ?since="""
+    since = request.args.get("since", -1, type=int)
+    if not _status_waiters.acquire(blocking=False):
+        return jsonify({
+            "version": status_version,
+            "status": sync_status,
+            "retry_after": STATUS_RETRY_AFTER_SECONDS,
+        })
+    try:
+        with status_changed:
+            status_changed.wait_for(lambda: status_version != since, timeout=STATUS_WAIT_SECONDS)
+            version, snapshot = status_version, sync_status
+    finally:
+        _status_waiters.release()
+    return jsonify({"version": version, "status": snapshot})
+
+
+_SYNC_RUNNING_PAGE = """
+            <html><body>
+                <h1>Sync Already Running</h1>
+                <p>Sync is currently in progress. Please wait.</p>
+                <p><a href="/status">Check Status</a></p>
+                <script>setTimeout(() => window.location.href = '/status', 2000);</script>
+            </body></html>
+            """
+
+_SYNC_STARTED_PAGE = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -274,9 +399,9 @@ def sync():
             <meta charset="utf-8">
             <meta http-equiv="refresh" content="2;url=/status">
             <style>
-                body {{ font-family: Arial, sans-serif; max-width: 600px; margin: 100px auto; text-align: center; }}
-                .spinner {{ border: 4px solid #f3f3f3; border-top: 4px solid #3498db; border-radius: 50%; width: 40px; height: 40px; animation: spin 1s linear infinite; margin: 20px auto; }}
-                @keyframes spin {{ 0% {{ transform: rotate(0deg); }} 100% {{ transform: rotate(360deg); }} }}
+                body { font-family: Arial, sans-serif; max-width: 600px; margin: 100px auto; text-align: center; }
+                .spinner { border: 4px solid #f3f3f3; border-top: 4px solid #3498db; border-radius: 50%; width: 40px; height: 40px; animation: spin 1s linear infinite; margin: 20px auto; }
+                @keyframes spin { 0% { transform: rotate(0deg); } 100% { transform: rotate(360deg); } }
             </style>
         </head>
         <body>
@@ -286,26 +411,9 @@ def sync():
             <p><a href="/status">View Status</a></p>
         </body>
         </html>
-        """, 200
-    else:
-        # Return JSON
-        return jsonify({
-            "message": "Sync started",
-            "status": sync_status
-        }), 202
+        """
 
-
-@app.route("/trigger", methods=["GET"])
-def trigger():
-    """Mobile-friendly trigger page - can be saved to iPhone home screen"""
-    global sync_status
-    
-    # Optional API key check
-    config = get_env_config()
-    if config["api_key"]:
-        provided_key = request.args.get("key")
-        if provided_key != config["api_key"]:
-            return """
+_ACCESS_DENIED_PAGE = """
             <!DOCTYPE html>
             <html>
             <head>
@@ -320,42 +428,11 @@ def trigger():
             </head>
             <body><div class="msg"><h1>🔒</h1><p>Invalid API Key</p></div></body>
             </html>
-            """, 401
-    
-    with sync_lock:
-        is_running = sync_status["running"]
-        current_status = sync_status.copy()
-    
-    # Build status display
-    if is_running:
-        status_class = "running"
-        status_icon = "🔄"
-        status_text = current_status.get("message", "Syncing...")
-        button_disabled = "disabled"
-        button_text = "Syncing..."
-    elif current_status.get("error"):
-        status_class = "error"
-        status_icon = "❌"
-        status_text = current_status.get("error", "Error")[:50]
-        button_disabled = ""
-        button_text = "Retry Sync"
-    elif current_status.get("completed_at"):
-        status_class = "success"
-        status_icon = "✅"
-        status_text = "Sync completed"
-        button_disabled = ""
-        button_text = "Sync Again"
-    else:
-        status_class = "ready"
-        status_icon = "📚"
-        status_text = "Ready to sync"
-        button_disabled = ""
-        button_text = "Sync Now"
-    
-    # API key param for redirects
-    key_param = f"?key={config['api_key']}" if config["api_key"] else ""
-    
-    html = f"""
+            """
+
+
+# /trigger page; $placeholders keep the CSS braces as written
+_TRIGGER_PAGE = string.Template("""
     <!DOCTYPE html>
     <html>
     <head>
@@ -367,8 +444,8 @@ def trigger():
         <link rel="apple-touch-icon" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 100 100'><text y='.9em' font-size='90'>📚</text></svg>">
         <title>WeRead Sync</title>
         <style>
-            * {{ box-sizing: border-box; margin: 0; padding: 0; }}
-            body {{ 
+            * { box-sizing: border-box; margin: 0; padding: 0; }
+            body { 
                 font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
                 background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
                 min-height: 100vh;
@@ -378,22 +455,22 @@ def trigger():
                 justify-content: center;
                 padding: 20px;
                 color: #fff;
-            }}
-            .container {{ text-align: center; width: 100%; max-width: 400px; }}
-            .icon {{ font-size: 80px; margin-bottom: 20px; }}
-            h1 {{ font-size: 24px; margin-bottom: 10px; font-weight: 600; }}
-            .status {{
+            }
+            .container { text-align: center; width: 100%; max-width: 400px; }
+            .icon { font-size: 80px; margin-bottom: 20px; }
+            h1 { font-size: 24px; margin-bottom: 10px; font-weight: 600; }
+            .status {
                 padding: 15px 25px;
                 border-radius: 12px;
                 margin: 20px 0;
                 font-size: 16px;
-            }}
-            .status.ready {{ background: rgba(255,255,255,0.1); }}
-            .status.running {{ background: rgba(59,130,246,0.3); animation: pulse 1.5s infinite; }}
-            .status.success {{ background: rgba(34,197,94,0.3); }}
-            .status.error {{ background: rgba(239,68,68,0.3); }}
-            @keyframes pulse {{ 0%, 100% {{ opacity: 1; }} 50% {{ opacity: 0.7; }} }}
-            .btn {{
+            }
+            .status.ready { background: rgba(255,255,255,0.1); }
+            .status.running { background: rgba(59,130,246,0.3); animation: pulse 1.5s infinite; }
+            .status.success { background: rgba(34,197,94,0.3); }
+            .status.error { background: rgba(239,68,68,0.3); }
+            @keyframes pulse { 0%, 100% { opacity: 1; } 50% { opacity: 0.7; } }
+            .btn {
                 display: block;
                 width: 100%;
                 padding: 20px 40px;
@@ -405,16 +482,16 @@ def trigger():
                 transition: all 0.2s;
                 text-decoration: none;
                 margin-top: 20px;
-            }}
-            .btn-primary {{
+            }
+            .btn-primary {
                 background: linear-gradient(135deg, #3b82f6 0%, #2563eb 100%);
                 color: white;
                 box-shadow: 0 4px 15px rgba(59, 130, 246, 0.4);
-            }}
-            .btn-primary:hover {{ transform: translateY(-2px); box-shadow: 0 6px 20px rgba(59, 130, 246, 0.5); }}
-            .btn-primary:active {{ transform: translateY(0); }}
-            .btn:disabled {{ opacity: 0.6; cursor: not-allowed; transform: none !important; }}
-            .spinner {{
+            }
+            .btn-primary:hover { transform: translateY(-2px); box-shadow: 0 6px 20px rgba(59, 130, 246, 0.5); }
+            .btn-primary:active { transform: translateY(0); }
+            .btn:disabled { opacity: 0.6; cursor: not-allowed; transform: none !important; }
+            .spinner {
                 display: inline-block;
                 width: 20px;
                 height: 20px;
@@ -424,10 +501,10 @@ def trigger():
                 animation: spin 1s linear infinite;
                 margin-right: 10px;
                 vertical-align: middle;
-            }}
-            @keyframes spin {{ to {{ transform: rotate(360deg); }} }}
-            .footer {{ margin-top: 40px; font-size: 12px; opacity: 0.5; }}
-            .footer a {{ color: inherit; }}
+            }
+            @keyframes spin { to { transform: rotate(360deg); } }
+            .footer { margin-top: 40px; font-size: 12px; opacity: 0.5; }
+            .footer a { color: inherit; }
         </style>
     </head>
     <body>
@@ -435,47 +512,205 @@ def trigger():
             <div class="icon">📚</div>
             <h1>WeRead → Notion</h1>
             
-            <div class="status {status_class}">
-                <span>{status_icon}</span> {status_text}
+            <div class="status $status_class">
+                <span>$status_icon</span> $status_text
             </div>
             
-            <form action="/sync{key_param}" method="GET">
-                <button type="submit" class="btn btn-primary" {button_disabled}>
-                    {"<span class='spinner'></span>" if is_running else ""}{button_text}
+            <form action="/sync$key_param" method="GET">
+                <button type="submit" class="btn btn-primary" $button_disabled>
+                    $spinner$button_text
                 </button>
             </form>
             
             <p class="footer">
-                <a href="/status{key_param}">View Details</a>
+                <a href="/status$key_param">View Details</a>
             </p>
         </div>
         
         <script>
             // Auto-refresh when sync is running
-            {"setInterval(() => location.reload(), 3000);" if is_running else ""}
+            $auto_reload
         </script>
     </body>
     </html>
+    """)
+
+
+@functools.lru_cache(maxsize=16)
+def _render_trigger_page(
+    status_class: str,
+    status_icon: str,
+    status_text: str,
+    button_disabled: str,
+    button_text: str,
+    is_running: bool,
+    key_param: str,
+) -> str:
     """
-    return html
+    Render the /trigger page. Its inputs take only a handful of distinct
+    values (mostly the current status), so repeat polls reuse the result.
+    """
+    return _TRIGGER_PAGE.substitute(
+        status_class=status_class,
+        status_icon=status_icon,
+        status_text=status_text,
+        button_disabled=button_disabled,
+        button_text=button_text,
+        key_param=key_param,
+        spinner="<span class='spinner'></span>" if is_running else "",
+        auto_reload="setInterval(() => location.reload(), 3000);" if is_running else "",
+    )
 
 
-@app.route("/health", methods=["GET"])
-def health():
-    """Health check endpoint"""
+@app.route("/sync", methods=["GET", "POST"])
+def sync():
+    """Trigger sync - GET returns HTML, POST returns JSON"""
+    global sync_status
+    
+    # Optional API key check
+    config = get_env_config()
+    if config.api_key:
+        provided_key = request.args.get("key") or request.headers.get("X-API-Key")
+        if provided_key != config.api_key:
+            return jsonify({"error": "Invalid API key"}), 401
+    
+    # Check if already running (run_sync_in_thread re-checks under the lock)
+    current_status = sync_status
+    if current_status["running"]:
+        if request.method == "GET":
+            return _SYNC_RUNNING_PAGE, 200
+        else:
+            return jsonify({"error": "Sync already running", "status": current_status}), 409
+    
+    # Start sync in background thread
+    thread = threading.Thread(target=run_sync_in_thread, daemon=True)
+    thread.start()
+    
+    if request.method == "GET":
+        # Return HTML page that auto-refreshes
+        return _SYNC_STARTED_PAGE, 200
+    else:
+        # Return JSON
+        return jsonify({
+            "message": "Sync started",
+            "status": sync_status
+        }), 202
+
+
+@app.route("/trigger", methods=["GET"])
+def trigger():
+    """Mobile-friendly trigger page - can be saved to iPhone home screen"""
+    global sync_status
+    
+    # Optional API key check
     config = get_env_config()
+    if config.api_key:
+        provided_key = request.args.get("key")
+        if provided_key != config.api_key:
+            return _ACCESS_DENIED_PAGE, 401
+    
+    current_status = sync_status  # an immutable snapshot, no copy needed
+    is_running = current_status["running"]
+    
+    # Build status display
+    if is_running:
+        status_class = "running"
+        status_icon = "🔄"
+        status_text = current_status.get("message", "Syncing...")
+        button_disabled = "disabled"
+        button_text = "Syncing..."
+    elif current_status.get("error"):
+        status_class = "error"
+        status_icon = "❌"
+        status_text = current_status.get("error", "Error")[:50]
+        button_disabled = ""
+        button_text = "Retry Sync"
+    elif current_status.get("completed_at"):
+        status_class = "success"
+        status_icon = "✅"
+        status_text = "Sync completed"
+        button_disabled = ""
+        button_text = "Sync Again"
+    else:
+        status_class = "ready"
+        status_icon = "📚"
+        status_text = "Ready to sync"
+        button_disabled = ""
+        button_text = "Sync Now"
+    
+    # API key param for redirects
+    key_param = f"?key={config.api_key}" if config.api_key else ""
+    
+    return _render_trigger_page(
+        status_class, status_icon, status_text, button_disabled, button_text,
+        is_running, key_param,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _health_checks(config: ServerConfig) -> tuple:
+    """(status, checks, HTTP code) for a configuration; only sync_running varies per call"""
     checks = {
-        "notion_token": bool(config["notion_token"]),
-        "notion_database_id": bool(config["notion_database_id"]),
-        "weread_cookies": bool(config["weread_cookies"]),
+        "notion_token": bool(config.notion_token),
+        "notion_database_id": bool(config.notion_database_id),
+        "weread_cookies": bool(config.weread_cookies),
     }
     all_ok = all(checks.values())
-    
-    return jsonify({
-        "status": "healthy" if all_ok else "unhealthy",
+    return ("healthy" if all_ok else "unhealthy"), checks, (200 if all_ok else 503)
+
+
+@app.route("/health", methods=["GET"])
+def health():
+    """Health check endpoint"""
+    status_text, checks, code = _health_checks(get_env_config())
+    payload = {
+        "status": status_text,
         "checks": checks,
         "sync_running": sync_status["running"]
-    }), 200 if all_ok else 503
+    }
+    body = orjson.dumps(payload) if orjson is not None else app.json.dumps(payload)
+    return Response(body, status=code, mimetype="application/json")
+
+
+@app.route("/admin/reload", methods=["POST"])
+def reload_config():
+    """
+    Re-read .env and drop the cached configuration.
+    Unlike the other routes this one always requires SYNC_API_KEY; it is
+    disabled when no key is configured.
+    """
+    config = get_env_config()
+    if not config.api_key:
+        return jsonify({"error": "Set SYNC_API_KEY to enable /admin/reload"}), 403
+    provided_key = request.args.get("key") or request.headers.get("X-API-Key")
+    if provided_key != config.api_key:
+        return jsonify({"error": "Invalid API key"}), 401
+    
+    if ENV_PATH.exists():
+        try:
+            from dotenv import load_dotenv
+            load_dotenv(ENV_PATH, override=True)
+        except ImportError:
+            pass
+    clear_env_cache()
+    return jsonify({"message": "Configuration reloaded"})
+
+
+def run_server(host: str, port: int):
+    """
+    Serve the app with waitress (multi-threaded) if installed, else Flask's server.
+    Set SYNC_SERVER_DEV=1 to use Flask's development server on purpose.
+    """
+    serve = None
+    if env("SYNC_SERVER_DEV").lower() not in TRUTHY_VALUES:
+        try:
+            from waitress import serve
+        except ImportError:
+            print("⚠️  waitress not installed — falling back to Flask's development server")
+    if serve is None:
+        app.run(host=host, port=port, debug=False, threaded=True)
+        return
+    serve(app, host=host, port=port, threads=SERVER_THREADS)
 
 
 if __name__ == "__main__":
@@ -493,9 +728,11 @@ if __name__ == "__main__":
       - GET  /          : Home page with instructions
       - GET  /trigger   : Mobile-friendly sync button (for iPhone)
       - GET  /status    : Get sync status (JSON)
+      - GET  /status/wait?since=N : Long-poll until the status changes
       - GET  /sync      : Trigger sync (HTML page)
       - POST /sync      : Trigger sync (JSON response)
       - GET  /health    : Health check
+      - POST /admin/reload : Re-read .env without restarting (needs SYNC_API_KEY)
     
     For iPhone:
       1. Open http://localhost:{port}/trigger in Safari
@@ -511,4 +748,4 @@ if __name__ == "__main__":
     {'='*60}
     """)
     
-    app.run(host=host, port=port, debug=False)
+    run_server(host, port)
@@ -16,8 +16,11 @@ Uses cookie-based auth. The WeRead web API has these endpoints:
 import functools
 import math
 import os
+import threading
 import time
+import traceback
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -25,10 +28,33 @@ from typing import Any, Dict, List, Optional, Tuple
 import dateutil.tz
 import requests
 from dateutil import parser as dtparser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    def _json(resp: requests.Response) -> Any:
+        """Decode a JSON response body straight from bytes."""
+        try:
+            return orjson.loads(resp.content)
+        except orjson.JSONDecodeError:
+            # Re-decode through requests so callers (and _retry) still get its
+            # JSONDecodeError, which is a RequestException
+            return resp.json()
+except ImportError:
+    def _json(resp: requests.Response) -> Any:
+        return resp.json()
 
 from config import (
+    ENV_PATH,
+    clear_env_cache,
     env,
+    first_value,
+    format_cookies,
+    parse_cookies,
     translate_genres,
+    update_env_file,
     WEREAD_API_BASE,
     WEREAD_SHELF_API,
     WEREAD_BOOK_INFO_API,
@@ -40,6 +66,70 @@ from config import (
 )
 
 
+# errCode values WeRead returns (often with HTTP 200) for expired/invalid cookies
+AUTH_ERROR_CODES = frozenset({-2010, -2012, -1, 401, 403})
+
+# A successful validate_cookies() is not repeated within this window
+VALIDATION_TTL_SECONDS = 300
+
+# Fixed query parameters, built once; requests never mutates params
+_SHELF_PARAMS = {"synckey": 0, "lectureSynckey": 0}
+_READ_INFO_PARAMS = {"readingDetail": 1, "readingBookIndex": 1, "finishedDate": 1}
+_REVIEW_LIST_PARAMS = {"listType": 11, "mine": 1, "syncKey": 0}
+
+# Resolved once; tzlocal() re-reads the system zone settings on every call
+_LOCAL_TZ = dateutil.tz.tzlocal()
+
+# Requests issued concurrently for one book by get_single_book_data
+PER_BOOK_REQUESTS = 5
+
+# Book workers share one session and each fans out its per-book requests, so
+# the default 10-connection pool would keep discarding kept-alive sockets.
+HTTP_POOL_SIZE = 32
+
+
+def make_http_adapter(pool_size: int = HTTP_POOL_SIZE) -> HTTPAdapter:
+    """
+    Build a keep-alive adapter holding up to ``pool_size`` connections per host.
+
+    Throttling and gateway errors are retried at the transport level with a
+    short backoff; the final response is still returned so callers see the
+    status through raise_for_status() as before.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 502, 503, 504),
+        raise_on_status=False,
+    )
+    return HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+
+
+def _new_session() -> requests.Session:
+    """Create a session using the pooled, retrying adapter."""
+    session = requests.Session()
+    session.mount("https://", make_http_adapter())
+    return session
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_str(text: str) -> datetime:
+    """
+    Parse a date string, assuming local time when it carries no zone.
+
+    Books synced in one batch share timestamps, so results are cached by the
+    raw string (datetimes are immutable, so sharing them is safe).
+    """
+    # ISO-8601 is the common case; dateutil only handles the rest
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        parsed = dtparser.parse(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=_LOCAL_TZ)
+    return parsed
+
+
 # ---------------------------------------------------------------------------
 # Retry decorator
 # ---------------------------------------------------------------------------
@@ -77,6 +167,25 @@ def _retry(max_attempts: int = 3, wait_seconds: float = 5.0):
     return decorator
 
 
+# ---------------------------------------------------------------------------
+# Shelf payload helpers
+# ---------------------------------------------------------------------------
+
+def book_info_extractor(sample: Optional[Dict[str, Any]]):
+    """
+    Return a function that pulls book metadata out of a shelf entry.
+
+    Shelf entries nest the metadata under "bookInfo" or "book", or are the
+    metadata themselves. All entries of one payload share the same shape, so
+    the key is detected once from ``sample`` instead of probed per entry.
+    """
+    if sample:
+        for key in ("bookInfo", "book"):
+            if key in sample:
+                return lambda item, key=key: item.get(key, item)
+    return lambda item: item
+
+
 # ---------------------------------------------------------------------------
 # WeReadAPI
 # ---------------------------------------------------------------------------
@@ -84,22 +193,54 @@ def _retry(max_attempts: int = 3, wait_seconds: float = 5.0):
 class WeReadAPI:
     """Direct API client for WeRead."""
 
-    def __init__(self, cookies: str, auto_refresh: bool = False):
+    def __init__(
+        self,
+        cookies: str,
+        auto_refresh: bool = False,
+        session: Optional[requests.Session] = None,
+    ):
         """
         Args:
             cookies: Cookie string (e.g. "wr_skey=xxx; wr_vid=xxx; wr_rt=xxx")
             auto_refresh: If True, open a browser to re-login when cookies expire.
+            session: Existing session to reuse (shares its keep-alive connection
+                     pool and cookie jar). Cookies already in its jar take
+                     precedence over ``cookies``. A new one is created if omitted.
         """
         self.auto_refresh = auto_refresh
-        self.session = requests.Session()
+        # Only a session created here is closed by close(); a shared one
+        # belongs to whoever passed it in.
+        self._owns_session = session is None
+        self.session = session if session is not None else _new_session()
         # Do NOT set Referer — WeRead's bookmarklist API returns empty when
         # a Referer header is present. The weread2notion project sets no
         # custom headers at all; we only keep a minimal User-Agent.
 
+        # Shelf payload from validate_cookies(), handed to the next get_shelf()
+        self._validated_shelf: Optional[Dict[str, Any]] = None
+        # monotonic() deadline until which the last validation is trusted
+        self._validated_until = 0.0
+        # sync_books_from_api's book workers (and each book's request threads)
+        # all share one client; auth failures that arrive together must
+        # trigger a single renewal.
+        self._auth_lock = threading.Lock()
+
         self.cookie_dict: Dict[str, str] = {}
         if cookies:
             self.cookie_dict = self._parse_cookie_string(cookies)
-            self.session.cookies.update(self.cookie_dict)
+            if self._owns_session:
+                self.session.cookies.update(self.cookie_dict)
+            else:
+                # A shared jar belongs to its owner and may already hold
+                # renewed cookies; never overwrite them with our (possibly
+                # stale) string, only adopt their values and fill in gaps.
+                jar = self.session.cookies
+                for cookie in jar:
+                    if cookie.name in self.cookie_dict:
+                        self.cookie_dict[cookie.name] = cookie.value
+                for name, value in self.cookie_dict.items():
+                    if name not in jar:
+                        jar.set(name, value)
 
             required = ["wr_skey", "wr_vid", "wr_rt"]
             missing = [c for c in required if c not in self.cookie_dict]
@@ -114,50 +255,62 @@ class WeReadAPI:
             print(f"[API] Loaded {len(self.cookie_dict)} cookies: "
                   f"{', '.join(self.cookie_dict.keys())}")
 
+    def close(self) -> None:
+        """Release the pooled connections of a session this client created."""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self) -> "WeReadAPI":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     # ------------------------------------------------------------------
     # Cookie helpers
     # ------------------------------------------------------------------
 
     @staticmethod
     def _parse_cookie_string(raw: str) -> Dict[str, str]:
-        raw = raw.strip().strip("\"'")
-        result: Dict[str, str] = {}
-        for item in raw.split(";"):
-            item = item.strip()
-            if "=" in item:
-                key, value = item.split("=", 1)
-                key, value = key.strip(), value.strip()
-                if "%" in value:
-                    try:
-                        value = urllib.parse.unquote(value)
-                    except Exception:
-                        pass
-                result[key] = value
+        result = parse_cookies(raw.strip().strip("\"'"))
+        for key, value in result.items():
+            if "%" in value:
+                try:
+                    result[key] = urllib.parse.unquote(value)
+                except Exception:
+                    pass
         return result
 
     def get_cookie_string(self) -> str:
         """Return current cookies as a semicolon-separated string."""
-        return "; ".join(f"{k}={v}" for k, v in sorted(self.cookie_dict.items()))
+        return format_cookies(self.cookie_dict, sort=True)
 
     # ------------------------------------------------------------------
     # Auth / validation
     # ------------------------------------------------------------------
 
     def validate_cookies(self) -> bool:
-        """Quick check — hit the shelf endpoint and see if we're authenticated."""
+        """
+        Quick check — hit the shelf endpoint and see if we're authenticated.
+        The shelf itself is kept for the next get_shelf() call, so a
+        validate-then-sync run downloads it only once.
+        A successful check is trusted for VALIDATION_TTL_SECONDS.
+        """
+        if time.monotonic() < self._validated_until:
+            return True
         try:
             resp = self.session.get(
                 WEREAD_SHELF_API,
-                params={"synckey": 0, "lectureSynckey": 0},
+                params=_SHELF_PARAMS,
                 timeout=10,
             )
             if resp.status_code == 401:
                 self._handle_auth_error(resp, "validate_cookies")
                 return False
 
-            data = resp.json()
+            data = _json(resp)
             err = data.get("errCode")
-            if err in (-2010, -2012, -1, 401, 403):
+            if err in AUTH_ERROR_CODES:
                 print(f"[API] Cookie validation failed (errCode={err})")
                 self._handle_auth_error(resp, "validate_cookies")
                 return False
@@ -167,7 +320,12 @@ class WeReadAPI:
                 self._persist_cookies_to_env()
 
             print("[API] Cookie validation OK")
-            return resp.status_code == 200
+            if resp.status_code != 200:
+                return False
+            # This is the full shelf; let the next get_shelf() use it
+            self._validated_shelf = data
+            self._validated_until = time.monotonic() + VALIDATION_TTL_SECONDS
+            return True
 
         except requests.exceptions.RequestException as e:
             print(f"[API] Cookie validation error: {e}")
@@ -178,32 +336,42 @@ class WeReadAPI:
         Called when an API response looks like an auth failure.
         Returns True only if cookies were successfully refreshed (caller should retry).
         """
+        self._validated_until = 0.0
         err_code = err_msg = None
         try:
-            data = response.json()
+            data = _json(response)
             err_code = data.get("errCode")
             err_msg = data.get("errMsg", "")
         except Exception:
             pass
 
-        print(f"\n[AUTH] Cookie expired — detected in {caller}")
-        if err_code:
-            print(f"[AUTH] errCode={err_code}  errMsg={err_msg}")
+        with self._auth_lock:
+            # Another thread may have renewed while this request was in flight
+            # or while we waited for the lock; if so, just retry with its key.
+            skey = self.cookie_dict.get("wr_skey")
+            request = getattr(response, "request", None)
+            sent = request.headers.get("Cookie", "") if request is not None else ""
+            if skey and f"wr_skey={skey}" not in sent:
+                return True
 
-        # Try silent renewal first (works headlessly, no browser needed)
-        if self.renew_cookies_silent():
-            return True
+            print(f"\n[AUTH] Cookie expired — detected in {caller}")
+            if err_code:
+                print(f"[AUTH] errCode={err_code}  errMsg={err_msg}")
 
-        # Fall back to browser-based refresh if enabled
-        if self.auto_refresh:
-            print("[AUTH] Attempting automatic browser-based cookie refresh...")
-            if self._refresh_cookies_from_browser():
-                print("[AUTH] Refresh succeeded")
+            # Try silent renewal first (works headlessly, no browser needed)
+            if self.renew_cookies_silent():
                 return True
-            print("[AUTH] Refresh failed")
 
-        print("[AUTH] Update WEREAD_COOKIES in .env (wr_skey, wr_vid, wr_rt)")
-        return False
+            # Fall back to browser-based refresh if enabled
+            if self.auto_refresh:
+                print("[AUTH] Attempting automatic browser-based cookie refresh...")
+                if self._refresh_cookies_from_browser():
+                    print("[AUTH] Refresh succeeded")
+                    return True
+                print("[AUTH] Refresh failed")
+
+            print("[AUTH] Update WEREAD_COOKIES in .env (wr_skey, wr_vid, wr_rt)")
+            return False
 
     # ------------------------------------------------------------------
     # Cookie persistence
@@ -211,7 +379,8 @@ class WeReadAPI:
 
     def _update_cookies_from_response(self, response) -> bool:
         """Extract wr_* cookies from Set-Cookie headers and update session."""
-        header = response.headers.get("set-cookie") or response.headers.get("Set-Cookie")
+        # requests headers are case-insensitive, one lookup covers both spellings
+        header = response.headers.get("set-cookie")
         if not header:
             return False
 
@@ -237,24 +406,11 @@ class WeReadAPI:
             if not wr_cookies:
                 return False
 
-            cookie_str = "; ".join(f"{k}={v}" for k, v in sorted(wr_cookies.items()))
+            cookie_str = format_cookies(wr_cookies, sort=True)
 
-            env_path = Path(__file__).parent.parent / ".env"
-            if not env_path.exists():
+            if not ENV_PATH.exists():
                 return False
-
-            lines = env_path.read_text(encoding="utf-8").split("\n")
-            new_lines, replaced = [], False
-            for line in lines:
-                s = line.strip()
-                if s.startswith("WEREAD_COOKIES=") or s.startswith("#WEREAD_COOKIES="):
-                    new_lines.append(f'WEREAD_COOKIES="{cookie_str}"')
-                    replaced = True
-                else:
-                    new_lines.append(line)
-            if not replaced:
-                new_lines.append(f'WEREAD_COOKIES="{cookie_str}"')
-            env_path.write_text("\n".join(new_lines), encoding="utf-8")
+            update_env_file("WEREAD_COOKIES", cookie_str, ENV_PATH)
 
             self._update_gist_cookies(cookie_str)
             return True
@@ -299,7 +455,7 @@ class WeReadAPI:
 
             # Check for API-level errors even on HTTP 200
             try:
-                body = resp.json()
+                body = _json(resp)
                 err = body.get("errCode")
                 if err and err != 0:
                     print(f"[AUTH] Silent renewal rejected: errCode={err} "
@@ -320,7 +476,12 @@ class WeReadAPI:
         return False
 
     def _refresh_cookies_from_browser(self) -> bool:
-        """Run scripts/fetch_cookies_auto.py (headless first, then interactive)."""
+        """Run scripts/fetch_cookies_auto.py (headless first, then interactive).
+
+        Always passes --force: this only runs after WeRead rejected the current
+        cookies, so the script's "saved cookies still valid" shortcut must not
+        hand the same cookies back.
+        """
         try:
             import subprocess, sys
             script = Path(__file__).parent.parent / "scripts" / "fetch_cookies_auto.py"
@@ -330,13 +491,13 @@ class WeReadAPI:
             # Try headless first (reuses saved browser profile, no GUI needed)
             print("[AUTH] Trying headless browser cookie refresh ...")
             result = subprocess.run(
-                [sys.executable, str(script), "--headless"],
+                [sys.executable, str(script), "--headless", "--force"],
                 capture_output=True, text=True, timeout=60,
             )
             if result.returncode != 0:
                 print("[AUTH] Headless refresh failed — opening browser for login ...")
                 result = subprocess.run(
-                    [sys.executable, str(script)],
+                    [sys.executable, str(script), "--force"],
                     capture_output=True, text=True, timeout=120,
                 )
             if result.returncode != 0:
@@ -347,6 +508,7 @@ class WeReadAPI:
                 try:
                     from dotenv import load_dotenv
                     load_dotenv(env_path, override=True)
+                    clear_env_cache()
                 except ImportError:
                     pass
 
@@ -364,28 +526,39 @@ class WeReadAPI:
     # API methods — each maps to exactly one WeRead endpoint
     # ------------------------------------------------------------------
 
-    @_retry(max_attempts=3, wait_seconds=5.0)
     def get_shelf(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
         GET /web/shelf/sync
         Returns (full_response, books_list, book_progress_list).
+        The payload downloaded by a successful validate_cookies() is used once
+        instead of fetching the whole shelf again.
         """
+        data, self._validated_shelf = self._validated_shelf, None
+        if data is None:
+            data = self._fetch_shelf()
+            if data is None:
+                return {}, [], []
+
+        books = data.get("books", [])
+        progress = data.get("bookProgress", [])
+        print(f"[API] Shelf: {len(books)} books, {len(progress)} with progress")
+        return data, books, progress
+
+    @_retry(max_attempts=3, wait_seconds=5.0)
+    def _fetch_shelf(self) -> Optional[Dict[str, Any]]:
+        """Download the shelf payload; None if the cookies were rejected."""
         resp = self.session.get(
             WEREAD_SHELF_API,
-            params={"synckey": 0, "lectureSynckey": 0},
+            params=_SHELF_PARAMS,
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = _json(resp)
 
         err = data.get("errCode")
-        if err and err in (-2010, -2012, -1, 401, 403):
+        if err in AUTH_ERROR_CODES:
             self._handle_auth_error(resp, "get_shelf")
-            return {}, [], []
-
-        books = data.get("books", [])
-        progress = data.get("bookProgress", [])
-        print(f"[API] Shelf: {len(books)} books, {len(progress)} with progress")
-        return data, books, progress
+            return None
+        return data
 
     @_retry(max_attempts=3, wait_seconds=5.0)
     def get_book_info(self, book_id: str) -> Optional[Dict[str, Any]]:
@@ -395,7 +568,7 @@ class WeReadAPI:
         """
         resp = self.session.get(WEREAD_BOOK_INFO_API, params={"bookId": book_id})
         resp.raise_for_status()
-        return resp.json() or None
+        return _json(resp) or None
 
     @_retry(max_attempts=3, wait_seconds=5.0)
     def get_read_info(self, book_id: str) -> Optional[Dict[str, Any]]:
@@ -405,11 +578,10 @@ class WeReadAPI:
         """
         resp = self.session.get(
             WEREAD_READ_INFO_API,
-            params={"bookId": book_id, "readingDetail": 1,
-                    "readingBookIndex": 1, "finishedDate": 1},
+            params={"bookId": book_id, **_READ_INFO_PARAMS},
         )
         resp.raise_for_status()
-        return resp.json() or None
+        return _json(resp) or None
 
     @_retry(max_attempts=3, wait_seconds=5.0)
     def get_bookmark_list(self, book_id: str) -> List[Dict[str, Any]]:
@@ -419,7 +591,7 @@ class WeReadAPI:
         """
         resp = self.session.get(WEREAD_BOOKMARKLIST_API, params={"bookId": book_id})
         resp.raise_for_status()
-        updated = resp.json().get("updated")
+        updated = _json(resp).get("updated")
         if not updated:
             return []
         return sorted(
@@ -443,12 +615,12 @@ class WeReadAPI:
         """
         resp = self.session.get(
             WEREAD_REVIEW_LIST_API,
-            params={"bookId": book_id, "listType": 11, "mine": 1, "syncKey": 0},
+            params={"bookId": book_id, **_REVIEW_LIST_PARAMS},
         )
         resp.raise_for_status()
 
         summary, regular, page, chapter = [], [], [], []
-        for item in resp.json().get("reviews", []):
+        for item in _json(resp).get("reviews", []):
             review = item.get("review", {})
             t = review.get("type")
             if t == 4:
@@ -471,7 +643,7 @@ class WeReadAPI:
         body = {"bookIds": [book_id], "synckeys": [0], "teenmode": 0}
         resp = self.session.post(WEREAD_CHAPTER_INFO_API, json=body)
         resp.raise_for_status()
-        data = resp.json()
+        data = _json(resp)
         if (data and "data" in data
                 and len(data["data"]) == 1
                 and "updated" in data["data"][0]):
@@ -490,29 +662,34 @@ class WeReadAPI:
         ``book_item`` is the shelf entry (already has book info + progress).
         """
         try:
-            # --- Book info (from shelf or /web/book/info) ---
-            book_info, progress = self._extract_book_info(book_id, book_item)
-
-            # --- Read info (progress, dates, reading time) ---
+            # --- Book info, read info, bookmarks, reviews, chapters ---
+            # The requests are independent, so issue them concurrently over the
+            # shared session instead of one after another. Book info usually
+            # comes from the shelf entry; its /web/book/info fallback overlaps
+            # with the other round trips instead of preceding them.
+            with ThreadPoolExecutor(max_workers=PER_BOOK_REQUESTS) as pool:
+                book_info_f = pool.submit(self._extract_book_info, book_id, book_item)
+                read_info_f = pool.submit(self.get_read_info, book_id)
+                bookmarks_f = pool.submit(self.get_bookmark_list, book_id)
+                reviews_f = pool.submit(self.get_review_list, book_id)
+                chapter_info_f = pool.submit(self.get_chapter_info, book_id)
+
+            book_info, progress = book_info_f.result()
             try:
-                read_info = self.get_read_info(book_id)
+                read_info = read_info_f.result()
             except Exception:
                 read_info = None
-
-            # --- Bookmarks + reviews ---
             try:
-                bookmarks = self.get_bookmark_list(book_id)
+                bookmarks = bookmarks_f.result()
             except Exception:
                 bookmarks = []
             try:
                 summary_reviews, regular_reviews, page_notes, chapter_notes = \
-                    self.get_review_list(book_id)
+                    reviews_f.result()
             except Exception:
                 summary_reviews, regular_reviews, page_notes, chapter_notes = [], [], [], []
-
-            # --- Chapter info ---
             try:
-                chapter_info = self.get_chapter_info(book_id)
+                chapter_info = chapter_info_f.result()
             except Exception:
                 chapter_info = None
 
@@ -542,7 +719,7 @@ class WeReadAPI:
             is_finished = self._check_finished(book_info, book_item, read_info)
             if is_finished:
                 status = "Read"
-            elif percent is not None and percent >= 5:
+            elif (percent or 0) >= 5:
                 status = "Currently Reading"
             else:
                 status = "To Be Read"
@@ -550,12 +727,13 @@ class WeReadAPI:
             # --- Current page ---
             current_page = None
             if total_page:
-                if status == "Read":
+                if is_finished:
                     current_page = total_page
-                elif reading_progress and reading_progress > 0:
-                    current_page = math.ceil((reading_progress / 100.0) * total_page)
-                elif percent and percent > 0:
-                    current_page = math.ceil((percent / 100.0) * total_page)
+                else:
+                    # readinfo progress is preferred over the shelf percentage
+                    page_pct = reading_progress if (reading_progress or 0) > 0 else percent
+                    if (page_pct or 0) > 0:
+                        current_page = math.ceil((page_pct / 100.0) * total_page)
 
             # --- Dates ---
             started_at, last_read_at, date_finished = self._extract_dates(
@@ -572,12 +750,12 @@ class WeReadAPI:
                 elif m > 0:
                     reading_time = f"{m}分"
 
-            title = book_info.get("title", f"Book {book_id}")
-            author = book_info.get("author", "")
+            bi_get = book_info.get
+            rating = bi_get("rating")
 
             return {
-                "title": title,
-                "author": author,
+                "title": bi_get("title", f"Book {book_id}"),
+                "author": bi_get("author", ""),
                 "current_page": int(current_page) if current_page else None,
                 "total_page": int(total_page) if total_page else None,
                 "percent": float(percent) if percent is not None else None,
@@ -586,10 +764,10 @@ class WeReadAPI:
                 "last_read_at": last_read_at,
                 "date_finished": date_finished,
                 "source": "WeRead",
-                "cover_image": book_info.get("cover"),
-                "genre": translate_genres(book_info.get("categories")),
+                "cover_image": bi_get("cover"),
+                "genre": translate_genres(bi_get("categories")),
                 "year_started": started_at.year if started_at else None,
-                "rating": float(book_info["rating"]) if book_info.get("rating") else None,
+                "rating": float(rating) if rating else None,
                 "bookmarks": all_bookmarks,
                 "summary_reviews": summary_reviews,
                 "page_notes": page_notes,
@@ -600,7 +778,6 @@ class WeReadAPI:
             }
         except Exception as e:
             print(f"[ERROR] Failed to get data for book {book_id}: {e}")
-            import traceback
             traceback.print_exc()
             return None
 
@@ -616,12 +793,9 @@ class WeReadAPI:
         progress = 0
 
         if book_item:
-            if "book" in book_item:
-                book_info = book_item["book"]
-            elif "bookInfo" in book_item:
-                book_info = book_item["bookInfo"]
-            elif "title" in book_item:
-                book_info = book_item
+            book_info = first_value(book_item, "book", "bookInfo") or (
+                book_item if "title" in book_item else {}
+            )
             progress = book_item.get("progress", 0)
 
         if not book_info.get("title"):
@@ -647,11 +821,11 @@ class WeReadAPI:
     ) -> Optional[int]:
         """Derive total page count from chapter word counts or book metadata."""
         if chapter_info:
-            words = sum(
-                ch.get("wordCount", 0)
-                for ch in chapter_info.values()
-                if isinstance(ch.get("wordCount"), (int, float))
-            )
+            words = 0
+            for ch in chapter_info.values():
+                count = ch.get("wordCount")
+                if isinstance(count, (int, float)):
+                    words += count
             if words > 0:
                 return round(words / 550)
 
@@ -668,11 +842,10 @@ class WeReadAPI:
         if book_item:
             if book_item.get("finishReading") == 1:
                 return True
-            if book_item.get("book", {}).get("finishReading") == 1:
+            nested = book_item.get("book")
+            if nested and nested.get("finishReading") == 1:
                 return True
-        if read_info and read_info.get("finishReading") == 1:
-            return True
-        return False
+        return bool(read_info) and read_info.get("finishReading") == 1
 
     def _extract_dates(
         self,
@@ -694,7 +867,7 @@ class WeReadAPI:
                 last_read_at = last_from_detail
 
         if book_item:
-            t = self._ts(book_item.get("readUpdateTime") or book_item.get("updateTime"))
+            t = self._ts(first_value(book_item, "readUpdateTime", "updateTime"))
             if t and (not last_read_at or t > last_read_at):
                 last_read_at = t
 
@@ -711,14 +884,10 @@ class WeReadAPI:
         if value is None:
             return None
         try:
-            tz = dateutil.tz.tzlocal()
             if isinstance(value, (int, float)):
                 if value > 1e10:
-                    return datetime.fromtimestamp(value / 1000, tz=tz)
-                return datetime.fromtimestamp(value, tz=tz)
-            parsed = dtparser.parse(str(value))
-            if parsed.tzinfo is None:
-                parsed = parsed.replace(tzinfo=tz)
-            return parsed
+                    return datetime.fromtimestamp(value / 1000, tz=_LOCAL_TZ)
+                return datetime.fromtimestamp(value, tz=_LOCAL_TZ)
+            return _parse_date_str(str(value))
         except Exception:
             return None
@@ -29,10 +29,12 @@ Optional env vars:
 import os
 import re
 import time
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, Tuple, List
 
+import dateutil.tz
 import yaml
 from notion_client import Client
 from dateutil import parser as dtparser
@@ -45,6 +47,7 @@ from watchdog.events import FileSystemEventHandler
 
 from config import (
     env,
+    first_value,
     PROP_TITLE,
     PROP_AUTHOR,
     PROP_STATUS,
@@ -88,16 +91,38 @@ FINISHED_HINT_PATTERNS = [
     r"(?:已读完|读完了|完成阅读|阅读完成|Finished)\b",
 ]
 
+# Compiled once here instead of looked up in re's cache on every call
+_DATE_RES = [re.compile(p) for p in DATE_PATTERNS]
+_PROGRESS_RES = [re.compile(p, re.IGNORECASE) for p in PROGRESS_PATTERNS]
+_PERCENT_RE = re.compile(PROGRESS_PATTERNS[-1])
+_FINISHED_RES = [re.compile(p, re.IGNORECASE) for p in FINISHED_HINT_PATTERNS]
+_HEADING_RE = re.compile(r"(?m)^\s*#\s+(.+?)\s*$")
+_AUTHOR_RE = re.compile(r"(?im)^\s*author\s*[:：]\s*(.+?)\s*$")
+_AUTHOR_CN_RE = re.compile(r"(?im)^\s*作者\s*[:：]\s*(.+?)\s*$")
+
+# Resolved once; tzlocal() re-reads the system zone settings on every call
+_LOCAL_TZ = dateutil.tz.tzlocal()
+
+
+def _parse_date(text: str) -> datetime:
+    """Parse a date string, trying the fast ISO-8601 parser before dateutil."""
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return dtparser.parse(text)
+
 
 # -------------------------
 # Markdown parsing
 # -------------------------
 
 def _read_text(p: Path) -> str:
+    # Read once and decode in memory; a bad byte no longer means a second read
+    data = p.read_bytes()
     try:
-        return p.read_text(encoding="utf-8")
+        return data.decode("utf-8")
     except UnicodeDecodeError:
-        return p.read_text(encoding="utf-8", errors="ignore")
+        return data.decode("utf-8", errors="ignore")
 
 def _parse_frontmatter(text: str) -> Dict[str, Any]:
     """
@@ -115,33 +140,37 @@ def _parse_frontmatter(text: str) -> Dict[str, Any]:
     except Exception:
         return {}
 
+# Frontmatter keys that may carry the book title, in priority order
+_TITLE_KEYS = ("title", "name")
+
+
 def _extract_title_author(text: str) -> Tuple[Optional[str], Optional[str]]:
     fm = _parse_frontmatter(text)
     title = None
     author = None
 
     if fm:
-        title = fm.get("title") or fm.get("name")
+        title = first_value(fm, *_TITLE_KEYS)
         author = fm.get("author")
 
     if not title:
-        m = re.search(r"(?m)^\s*#\s+(.+?)\s*$", text)
+        m = _HEADING_RE.search(text)
         title = m.group(1).strip() if m else None
 
     if not author:
-        m = re.search(r"(?im)^\s*author\s*[:：]\s*(.+?)\s*$", text)
+        m = _AUTHOR_RE.search(text)
         author = m.group(1).strip() if m else None
 
     if not author:
-        m = re.search(r"(?im)^\s*作者\s*[:：]\s*(.+?)\s*$", text)
+        m = _AUTHOR_CN_RE.search(text)
         author = m.group(1).strip() if m else None
 
     return title, author
 
 def _extract_progress(text: str) -> Tuple[Optional[int], Optional[int], Optional[float]]:
     # fraction current/total
-    for pat in PROGRESS_PATTERNS:
-        for m in re.finditer(pat, text, flags=re.IGNORECASE):
+    for pat in _PROGRESS_RES:
+        for m in pat.finditer(text):
             if m.lastindex == 2:
                 try:
                     c = int(m.group(1))
@@ -152,7 +181,7 @@ def _extract_progress(text: str) -> Tuple[Optional[int], Optional[int], Optional
                     pass
 
     # percent only
-    m = re.search(PROGRESS_PATTERNS[-1], text)
+    m = _PERCENT_RE.search(text)
     if m:
         try:
             p = float(m.group(1))
@@ -165,16 +194,43 @@ def _extract_progress(text: str) -> Tuple[Optional[int], Optional[int], Optional
 
 def _extract_dates(text: str) -> List[datetime]:
     out: List[datetime] = []
-    for pat in DATE_PATTERNS:
-        for m in re.finditer(pat, text):
+    for pat in _DATE_RES:
+        for m in pat.finditer(text):
             try:
-                out.append(dtparser.parse(m.group(1)))
+                out.append(_parse_date(m.group(1)))
             except Exception:
                 pass
     return out
 
 def _looks_finished(text: str) -> bool:
-    return any(re.search(p, text, flags=re.IGNORECASE) for p in FINISHED_HINT_PATTERNS)
+    return any(p.search(text) for p in _FINISHED_RES)
+
+# path -> ((mtime_ns, size), parsed fields). The watcher re-parses a whole book
+# folder whenever one file changes, so unchanged files are served from here.
+_MD_CACHE: Dict[Path, Tuple[Tuple[int, int], Tuple[Any, ...]]] = {}
+
+def _parse_md_file(p: Path) -> Tuple[Any, ...]:
+    """
+    Return (title, author, progress, dates, finished) for one markdown file,
+    re-reading it only when its modification time or size has changed.
+    """
+    st = p.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _MD_CACHE.get(p)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    text = _read_text(p)
+    title, author = _extract_title_author(text)
+    parsed = (
+        title,
+        author,
+        _extract_progress(text),
+        tuple(_extract_dates(text)),
+        _looks_finished(text),
+    )
+    _MD_CACHE[p] = (stamp, parsed)
+    return parsed
 
 
 # -------------------------
@@ -197,7 +253,7 @@ def build_props(db_props: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, A
         if title_prop_name in db_props:
             props[title_prop_name] = {"title": [{"text": {"content": fields["title"]}}]}
         else:
-            available_props = ", ".join(list(db_props.keys())[:10])
+            available_props = ", ".join(islice(db_props, 10))
             raise ValueError(f"No title property found. Available: {available_props}...")
 
     if fields.get("author") is not None and fields.get("author") != "" and prop_exists(db_props, PROP_AUTHOR):
@@ -265,9 +321,8 @@ def build_props(db_props: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, A
         last_read_at = fields["last_read_at"]
         if hasattr(last_read_at, 'astimezone'):
             # Convert to local timezone if it has timezone info
-            import dateutil.tz
             if last_read_at.tzinfo is not None:
-                last_read_at = last_read_at.astimezone(dateutil.tz.tzlocal())
+                last_read_at = last_read_at.astimezone(_LOCAL_TZ)
         if hasattr(last_read_at, 'date'):
             date_str = last_read_at.date().isoformat()
         elif hasattr(last_read_at, 'isoformat'):
@@ -383,9 +438,8 @@ def build_update_props(notion: Client, page_id: str, db_props: Dict[str, Any], f
         last_read_at = fields["last_read_at"]
         if hasattr(last_read_at, 'astimezone'):
             # Convert to local timezone if it has timezone info
-            import dateutil.tz
             if last_read_at.tzinfo is not None:
-                last_read_at = last_read_at.astimezone(dateutil.tz.tzlocal())
+                last_read_at = last_read_at.astimezone(_LOCAL_TZ)
         if hasattr(last_read_at, 'date'):
             date_str = last_read_at.date().isoformat()
         elif hasattr(last_read_at, 'isoformat'):
@@ -399,9 +453,8 @@ def build_update_props(notion: Client, page_id: str, db_props: Dict[str, Any], f
         date_finished = fields["date_finished"]
         if hasattr(date_finished, 'astimezone'):
             # Convert to local timezone if it has timezone info
-            import dateutil.tz
             if date_finished.tzinfo is not None:
-                date_finished = date_finished.astimezone(dateutil.tz.tzlocal())
+                date_finished = date_finished.astimezone(_LOCAL_TZ)
         if hasattr(date_finished, 'date'):
             date_str = date_finished.date().isoformat()
         elif hasattr(date_finished, 'isoformat'):
@@ -422,8 +475,7 @@ def build_update_props(notion: Client, page_id: str, db_props: Dict[str, Any], f
                 date_prop = existing_props[PROP_STARTED_AT].get("date")
                 if date_prop and date_prop.get("start"):
                     try:
-                        from dateutil import parser as dtparser
-                        existing_started_at = dtparser.parse(date_prop["start"])
+                        existing_started_at = _parse_date(date_prop["start"])
                     except:
                         pass
             
@@ -666,22 +718,20 @@ def parse_book_folder(book_dir: Path) -> Optional[Dict[str, Any]]:
     finished_hint = False
 
     for p in md_files:
-        text = _read_text(p)
+        t, a, (c, tot, pct), dates, finished = _parse_md_file(p)
 
-        t, a = _extract_title_author(text)
         if t and not title:
             title = t
         if a and not author:
             author = a
 
-        c, tot, pct = _extract_progress(text)
         if c is not None and tot is not None:
             current_page, total_page = c, tot
         if pct is not None and percent is None:
             percent = pct
 
-        all_dates.extend(_extract_dates(text))
-        finished_hint = finished_hint or _looks_finished(text)
+        all_dates.extend(dates)
+        finished_hint = finished_hint or finished
 
     if not title:
         title = book_dir.name.strip()
@@ -21,7 +21,7 @@ Optional env vars: same as weread_notion_sync.py
 import os
 import sys
 import time
-import hashlib
+import traceback
 from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -50,12 +50,20 @@ except ImportError:
 sys.path.insert(0, str(Path(__file__).parent))
 
 from notion_client import Client
-from weread_api import WeReadAPI
+from weread_api import (
+    HTTP_POOL_SIZE,
+    PER_BOOK_REQUESTS,
+    WeReadAPI,
+    book_info_extractor,
+    make_http_adapter,
+)
 from config import (
     env,
+    first_value,
     PROP_TITLE, PROP_AUTHOR, PROP_STATUS, PROP_CURRENT_PAGE, PROP_TOTAL_PAGE,
     PROP_DATE_FINISHED, PROP_SOURCE, PROP_STARTED_AT, PROP_LAST_READ_AT,
     STATUS_TBR, STATUS_READING, STATUS_READ, SOURCE_WEREAD,
+    TRUTHY_VALUES, DISABLED_VALUES,
 )
 
 # Reuse Notion helpers
@@ -63,6 +71,10 @@ from weread_notion_sync import (
     get_db_properties, prop_exists, build_props, find_page_by_title, upsert_page
 )
 
+# Upper bound on WEREAD_MAX_WORKERS. Each book worker has up to
+# PER_BOOK_REQUESTS WeRead requests in flight, so 8 workers already means ~40.
+MAX_BOOK_WORKERS = 8
+
 
 # Helper functions for creating Notion blocks
 def get_heading(level: int, content: str) -> Dict[str, Any]:
@@ -191,8 +203,9 @@ def clear_page_blocks(notion: Client, page_id: str):
 
 def get_block_signature(block: Dict[str, Any]) -> str:
     """
-    Create a signature (hash) for a block based on its content.
-    Returns a unique identifier for the block's content.
+    Create a signature for a block based on its content.
+    Returns the block type and its stripped text joined by a NUL character
+    (see _content_signature), or a "<type>_..." marker for blocks without text.
     """
     block_type = block.get("type", "unknown")
     
@@ -214,13 +227,20 @@ def get_block_signature(block: Dict[str, Any]) -> str:
     
     # Create signature from content
     if content:
-        content_normalized = content.strip()
-        signature = hashlib.md5(content_normalized.encode('utf-8')).hexdigest()
-        return f"{block_type}_{signature}"
+        return _content_signature(block_type, content)
     
     return f"{block_type}_empty"
 
 
+def _content_signature(block_type: str, content: str) -> str:
+    """
+    Signatures are only compared within one sync run (as dict keys), so the
+    normalized text itself serves as the key; no digest needs computing.
+    The NUL separator keeps them distinct from the "<type>_empty" marker.
+    """
+    return f"{block_type}\x00{content.strip()}"
+
+
 def _extract_text_from_rich_text(rich_text: list) -> str:
     """Helper to extract text content from rich_text array"""
     if not rich_text:
@@ -274,10 +294,7 @@ def get_existing_blocks(notion: Client, page_id: str) -> Dict[str, str]:
                 
                 # Create signature
                 if content:
-                    content_normalized = content.strip()
-                    signature = hashlib.md5(content_normalized.encode('utf-8')).hexdigest()
-                    signature = f"{block_type}_{signature}"
-                    existing_blocks[signature] = block_id
+                    existing_blocks[_content_signature(block_type, content)] = block_id
             
             has_more = response.get("has_more", False)
     except Exception as e:
@@ -499,15 +516,23 @@ def print_all_notes(book_data: Dict[str, Any], book_title: str):
 
 def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, Any], weread_cookies: str, limit: Optional[int] = None, test_book_title: Optional[str] = None):
     """Fetch books from WeRead API and sync to Notion - processes one at a time with progress monitoring"""
-    import time
     start_time = time.time()
     
     print("[API] Initializing WeRead API client...")
     
     # Enable automatic cookie refresh if configured
-    auto_refresh = env("WEREAD_AUTO_REFRESH_COOKIES", "1").lower() in ("1", "true", "yes")
-    client = WeReadAPI(weread_cookies, auto_refresh=auto_refresh)
-    
+    auto_refresh = env("WEREAD_AUTO_REFRESH_COOKIES", "1").lower() in TRUTHY_VALUES
+    # The with-block releases the session's pooled connections on every exit,
+    # including the early returns and a failing worker loop
+    with WeReadAPI(weread_cookies, auto_refresh=auto_refresh) as client:
+        _sync_books_with_client(
+            client, notion, database_id, db_props, auto_refresh, start_time,
+            limit=limit, test_book_title=test_book_title,
+        )
+
+
+def _sync_books_with_client(client: WeReadAPI, notion: Client, database_id: str, db_props: Dict[str, Any], auto_refresh: bool, start_time: float, limit: Optional[int] = None, test_book_title: Optional[str] = None):
+    """Body of sync_books_from_api, run while the client is open"""
     if auto_refresh:
         print("[API] ✅ Automatic cookie refresh enabled")
         print("[API]    If cookies expire, browser will open automatically for login")
@@ -525,35 +550,18 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
     print("[API] Fetching shelf data...")
     shelf_data, all_books_list, book_progress_list = client.get_shelf()
     
-    # Get the current (possibly refreshed) cookies for thread clients
-    current_cookies = client.get_cookie_string()
-    
-    total_books = shelf_data.get("bookCount", 0) or shelf_data.get("pureBookCount", 0) or len(all_books_list)
+    total_books = first_value(shelf_data, "bookCount", "pureBookCount", default=len(all_books_list))
     print(f"[API] Total books in shelf: {total_books}")
     
     # Build a map of book_id -> book info from the 'books' field (has full info)
     books_map = {}
+    # The 'books' field structure varies between payloads - detect it once
+    extract_info = book_info_extractor(all_books_list[0] if all_books_list else None)
     for book_item in all_books_list:
-        # The 'books' field structure varies - try different possible structures
-        book_info = None
-        book_id = None
-        
-        # Try different possible structures
-        if "bookInfo" in book_item:
-            book_info = book_item["bookInfo"]
-            book_id = book_info.get("bookId")
-        elif "book" in book_item:
-            book_info = book_item["book"]
-            book_id = book_info.get("bookId")
-        elif "bookId" in book_item:
-            book_id = book_item["bookId"]
-            book_info = book_item
-        
-        if book_id and book_info:
-            books_map[book_id] = {
-                "book": book_info,
-                "has_full_info": True
-            }
+        book_info = extract_info(book_item)
+        book_id = book_info.get("bookId")
+        if book_id:
+            books_map[book_id] = book_info
     
     # Build a map of book_id -> progress from bookProgress
     progress_map = {}
@@ -562,46 +570,40 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
         if book_id:
             progress_map[book_id] = progress_item
     
-    # Combine: use books_map as base, add progress data
-    all_book_items = []
-    for book_id, book_data in books_map.items():
-        progress_data = progress_map.get(book_id, {})
-        # Include ALL progress data (chapterIdx, chapterUid, etc.) not just progress percentage
-        # Also include readUpdateTime from the book item if available, or use updateTime from progress
-        book_item_data = book_data["book"]
-        read_update_time = None
-        if isinstance(book_item_data, dict):
-            read_update_time = book_item_data.get("readUpdateTime")
-        if not read_update_time:
-            read_update_time = progress_data.get("updateTime")
-        
-        all_book_items.append({
+    def make_item(book_id, progress_data, book_info=None):
+        """One work item: shelf info (if any) plus ALL progress fields."""
+        get = progress_data.get
+        update_time = get("updateTime")
+        # Latest read time from the book item if available, else progress updateTime
+        read_update_time = book_info.get("readUpdateTime") if isinstance(book_info, dict) else None
+        item = {
             "bookId": book_id,
-            "book": book_item_data,
-            "progress": progress_data.get("progress", 0),
-            "updateTime": progress_data.get("updateTime"),
-            "readUpdateTime": read_update_time,  # Latest read time from book_item or progress
-            "chapterIdx": progress_data.get("chapterIdx"),  # Current chapter index
-            "chapterUid": progress_data.get("chapterUid"),
-            "chapterOffset": progress_data.get("chapterOffset"),
-            "readingTime": progress_data.get("readingTime"),  # Reading time in seconds
-            "has_full_info": True
-        })
+            "progress": get("progress", 0),
+            "updateTime": update_time,
+            "readUpdateTime": read_update_time or update_time,
+            "chapterIdx": get("chapterIdx"),  # Current chapter index
+            "chapterUid": get("chapterUid"),
+            "chapterOffset": get("chapterOffset"),
+            "readingTime": get("readingTime"),  # Reading time in seconds
+            "has_full_info": book_info is not None,
+        }
+        if book_info is not None:
+            item["book"] = book_info
+        return item
+    
+    # Combine: use books_map as base, add progress data
+    empty = {}
+    all_book_items = [
+        make_item(book_id, progress_map.get(book_id, empty), book_info)
+        for book_id, book_info in books_map.items()
+    ]
     
     # Add any books from progress_map that aren't in books_map (shouldn't happen, but just in case)
-    for book_id, progress_data in progress_map.items():
-        if book_id not in books_map:
-            all_book_items.append({
-                "bookId": book_id,
-                "progress": progress_data.get("progress", 0),
-                "updateTime": progress_data.get("updateTime"),
-                "readUpdateTime": progress_data.get("updateTime"),  # Use updateTime as readUpdateTime
-                "chapterIdx": progress_data.get("chapterIdx"),
-                "chapterUid": progress_data.get("chapterUid"),
-                "chapterOffset": progress_data.get("chapterOffset"),
-                "readingTime": progress_data.get("readingTime"),
-                "has_full_info": False
-            })
+    all_book_items.extend(
+        make_item(book_id, progress_data)
+        for book_id, progress_data in progress_map.items()
+        if book_id not in books_map
+    )
     
     print(f"[API] Combined {len(all_book_items)} books with full info and progress data")
     
@@ -613,11 +615,12 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
     if test_book_title:
         original_count = len(all_book_items)
         filtered_items = []
+        # Case-insensitive partial match; lowercase the needle once
+        needle = test_book_title.lower()
         for book_item in all_book_items:
             book_info = book_item.get("book", {})
-            title = book_info.get("title") or book_info.get("name") or ""
-            # Case-insensitive partial match
-            if test_book_title.lower() in title.lower():
+            title = first_value(book_info, "title", "name", default="")
+            if needle in title.lower():
                 filtered_items.append(book_item)
                 print(f"[TEST] Found matching book: '{title}' (bookId: {book_item.get('bookId')})")
         
@@ -629,7 +632,7 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
             print(f"[TEST] Available book titles (first 10):")
             for i, book_item in enumerate(all_book_items[:10], 1):
                 book_info = book_item.get("book", {})
-                title = book_info.get("title") or book_info.get("name") or f"Book {book_item.get('bookId')}"
+                title = first_value(book_info, "title", "name") or f"Book {book_item.get('bookId')}"
                 print(f"[TEST]   {i}. {title}")
             return  # Only return if no books found
     
@@ -644,8 +647,19 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
     max_workers = int(env("WEREAD_MAX_WORKERS", "5"))
     if max_workers < 1:
         max_workers = 1
-    if max_workers > 20:
-        max_workers = 20  # Cap at 20 to avoid overwhelming the API
+    if max_workers > MAX_BOOK_WORKERS:
+        max_workers = MAX_BOOK_WORKERS  # Each worker fans out PER_BOOK_REQUESTS more
+    
+    # Size the shared connection pool so no worker has to open a throwaway
+    # connection; each worker has up to PER_BOOK_REQUESTS requests in flight.
+    client.session.mount("https://", make_http_adapter(
+        max(max_workers * PER_BOOK_REQUESTS, HTTP_POOL_SIZE),
+    ))
+    
+    # Mid-run auth failures only get the silent renewal, as the per-book
+    # clients did before; a browser login would stall every worker behind
+    # the client's auth lock.
+    client.auto_refresh = False
     
     print(f"\n{'='*60}")
     print(f"[PROGRESS] Processing {total_to_process} book(s) with {max_workers} parallel workers...")
@@ -659,6 +673,35 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
     # Thread-safe printing lock
     print_lock = Lock()
     
+    # Per-run settings shared by every worker (built once, not per book)
+    status_map = {
+        "Read": STATUS_READ,
+        "Currently Reading": STATUS_READING,
+        "To Be Read": STATUS_TBR,
+    }
+    
+    # Optional style/color filters from env vars
+    styles = None
+    colors = None
+    styles_str = env("WEREAD_STYLES")
+    colors_str = env("WEREAD_COLORS")
+    if styles_str:
+        try:
+            styles = [int(s.strip()) for s in styles_str.split(",")]
+        except:
+            pass
+    if colors_str:
+        try:
+            colors = [int(c.strip()) for c in colors_str.split(",")]
+        except:
+            pass
+    
+    clear_new_pages = env("WEREAD_CLEAR_BLOCKS", "true").lower() == "true"
+    
+    # A single-book run is a troubleshooting run: full tracebacks, no
+    # periodic progress lines, stop after the first result
+    single_book = limit == 1
+    
     def process_single_book(book_item_with_index):
         """Process a single book - designed for parallel execution"""
         i, book_item = book_item_with_index
@@ -680,13 +723,10 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
             with print_lock:
                 print(f"[{i}/{total_to_process}] 📖 Processing book {book_id}...")
             
-            # Create a new client instance for this thread (thread-safe)
-            # Use current_cookies which may have been refreshed by main client
-            # Disable auto_refresh in threads - main client handles refresh
-            thread_client = WeReadAPI(current_cookies, auto_refresh=False)
-            
-            # Get book data (this is where the work happens)
-            book_data = thread_client.get_single_book_data(book_id, book_item)
+            # Get book data (this is where the work happens). Every worker
+            # shares the main client: one connection pool, one cookie state,
+            # and one auth lock, so an expiry mid-run renews only once.
+            book_data = client.get_single_book_data(book_id, book_item)
             
             if book_data:
                 bookmarks = book_data.get("bookmarks", [])
@@ -697,17 +737,12 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
                 
                 if total_notes > 0:
                     # Count pure highlights vs highlights with user comments
-                    pure_highlights = sum(1 for b in bookmarks if b.get("reviewId") is None)
                     with_comments = sum(1 for b in bookmarks if b.get("reviewId") is not None)
+                    pure_highlights = len(bookmarks) - with_comments
                     with print_lock:
                         print(f"   [{i}/{total_to_process}] 📝 {pure_highlights} 划线, {with_comments} 笔记, {len(page_notes)} 页面, {len(chapter_notes)} 章节, {len(summary_reviews)} 书评")
                 
                 # Map status values
-                status_map = {
-                    "Read": STATUS_READ,
-                    "Currently Reading": STATUS_READING,
-                    "To Be Read": STATUS_TBR,
-                }
                 book_data["status"] = status_map.get(book_data.get("status"), STATUS_TBR)
                 book_data["source"] = SOURCE_WEREAD
                 
@@ -715,8 +750,7 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
                 page_id, is_new = upsert_page(notion, database_id, db_props, book_data)
                 
                 # Add bookmarks, reviews, quotes, and callouts as blocks
-                if page_id and (book_data.get("bookmarks") or book_data.get("summary_reviews") or 
-                               book_data.get("page_notes") or book_data.get("chapter_notes")):
+                if page_id and total_notes:
                     with print_lock:
                         if is_new:
                             print(f"[{i}/{total_to_process}] Adding bookmarks, notes, and reviews to new page...")
@@ -724,28 +758,9 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
                             print(f"[{i}/{total_to_process}] Syncing blocks to existing page...")
                     
                     try:
-                        # Get optional style/color filters from env vars
-                        styles = None
-                        colors = None
-                        styles_str = env("WEREAD_STYLES")
-                        colors_str = env("WEREAD_COLORS")
-                        if styles_str:
-                            try:
-                                styles = [int(s.strip()) for s in styles_str.split(",")]
-                            except:
-                                pass
-                        if colors_str:
-                            try:
-                                colors = [int(c.strip()) for c in colors_str.split(",")]
-                            except:
-                                pass
-                        
                         # For new pages, respect WEREAD_CLEAR_BLOCKS setting
                         # For existing pages, fully sync (add new, delete removed, keep existing)
-                        if is_new:
-                            clear_existing = env("WEREAD_CLEAR_BLOCKS", "true").lower() == "true"
-                        else:
-                            clear_existing = False  # For existing pages, use full sync (not clear)
+                        clear_existing = is_new and clear_new_pages
                         
                         blocks, grandchild = create_book_content_blocks(book_data, styles=styles, colors=colors)
                         if blocks or not is_new:
@@ -765,8 +780,7 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
                     except Exception as e:
                         with print_lock:
                             print(f"[{i}/{total_to_process}] ⚠️  Failed to add blocks: {e}")
-                        if limit == 1:  # Show full traceback for first book only
-                            import traceback
+                        if single_book:  # Show full traceback for first book only
                             traceback.print_exc()
                 
                 result["success"] = True
@@ -783,8 +797,7 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
             # Check if it's a cookie/auth error
             if "401" in error_msg or "LOGIN" in error_msg.upper() or "expired" in error_msg.lower():
                 result["cookie_error"] = True
-            if limit == 1:  # Show full traceback for first book only
-                import traceback
+            if single_book:  # Show full traceback for first book only
                 traceback.print_exc()
         
         result["time"] = time.time() - book_start_time
@@ -822,7 +835,7 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
                     print(f"❌ [{i}/{total_to_process}] Book {book_id}: {result['error']} | ⏱️  {book_time:.1f}s")
             
             # Progress update every 10 books or at the end
-            if (processed_count % 10 == 0 and limit != 1) or processed_count == total_to_process:
+            if (processed_count % 10 == 0 and not single_book) or processed_count == total_to_process:
                 elapsed = time.time() - start_time
                 rate = processed_count / elapsed if elapsed > 0 else 0
                 remaining = total_to_process - processed_count
@@ -834,7 +847,7 @@ def sync_books_from_api(notion: Client, database_id: str, db_props: Dict[str, An
                           f"⏳ ~{eta:.0f}s remaining\n")
             
             # Stop after first book if limit is 1
-            if limit == 1 and processed_count >= 1:
+            if single_book and processed_count >= 1:
                 # Cancel remaining tasks
                 for future in future_to_book:
                     future.cancel()
@@ -873,11 +886,11 @@ def main():
     if len(sys.argv) > 1 and sys.argv[1] in ("--server", "-s", "server"):
         print("Starting web server...")
         try:
-            from sync_web_server import app
+            from sync_web_server import run_server
             port = int(env("SYNC_SERVER_PORT", "8765"))
             host = env("SYNC_SERVER_HOST", "0.0.0.0")
             print(f"Server starting on http://{host}:{port}")
-            app.run(host=host, port=port, debug=False)
+            run_server(host, port)
         except ImportError as e:
             print(f"❌ Failed to import web server: {e}")
             print("   Make sure Flask is installed: pip install flask flask-cors")
@@ -909,7 +922,7 @@ def main():
     if test_book_title_raw:
         test_book_title = str(test_book_title_raw).strip()
         # Treat empty string, "none", "null", "false" as disabled
-        if not test_book_title or test_book_title.lower() in ("none", "null", "false", "off", "disable", "0"):
+        if test_book_title.lower() in DISABLED_VALUES:
             test_book_title = None
         else:
             # If it's set, check if it's commented in .env file